@@ -14,6 +14,10 @@ from db.base import Base
 from db.models.employee import Employee
 from db.models.resume import Resume
 from db.models.resume_chunk import ResumeChunk
+from db.models.embedding_cache import EmbeddingCacheEntry
+from db.models.corpus_version import CorpusVersion
+from db.models.resume_summary import ResumeSummary
+from db.models.employee_skill import EmployeeSkill
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
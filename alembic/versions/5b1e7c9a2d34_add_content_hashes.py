@@ -0,0 +1,32 @@
+"""Add content hashes to resumes and resume_chunks
+
+Revision ID: 5b1e7c9a2d34
+Revises: c267f4237d82
+Create Date: 2026-10-18 09:12:41.503112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9a2d34'
+down_revision: Union[str, Sequence[str], None] = 'c267f4237d82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('resume_chunks', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_resume_chunks_resume_id_content_hash', 'resume_chunks', ['resume_id', 'content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resume_chunks_resume_id_content_hash', table_name='resume_chunks')
+    op.drop_column('resume_chunks', 'content_hash')
+    op.drop_column('resumes', 'content_hash')
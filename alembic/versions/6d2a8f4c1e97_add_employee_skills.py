@@ -0,0 +1,40 @@
+"""Add employee skills
+
+Revision ID: 6d2a8f4c1e97
+Revises: 9a4f6e2c7b85
+Create Date: 2026-10-18 21:47:05.618230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2a8f4c1e97'
+down_revision: Union[str, Sequence[str], None] = '9a4f6e2c7b85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_skills',
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('skill', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('mentions', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('source', sa.String(), server_default='dictionary', nullable=False),
+    sa.Column('seniority', sa.String(), nullable=True),
+    sa.Column('years_experience', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('resume_id', 'skill')
+    )
+    op.create_index(op.f('ix_employee_skills_skill'), 'employee_skills', ['skill'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employee_skills_skill'), table_name='employee_skills')
+    op.drop_table('employee_skills')
@@ -0,0 +1,33 @@
+"""Unique resume per employee and file path
+
+Revision ID: 8e3f0a6c41b7
+Revises: 5b1e7c9a2d34
+Create Date: 2026-10-18 10:02:17.918244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f0a6c41b7'
+down_revision: Union[str, Sequence[str], None] = '5b1e7c9a2d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Conflict target for the bulk ingestion upsert (INSERT ... ON CONFLICT)
+    op.create_unique_constraint(
+        'uq_resumes_employee_email_file_path',
+        'resumes',
+        ['employee_email', 'file_path']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_resumes_employee_email_file_path', 'resumes', type_='unique')
@@ -0,0 +1,38 @@
+"""Add embedding cache
+
+Revision ID: a4c2d8e61f05
+Revises: 8e3f0a6c41b7
+Create Date: 2026-10-18 11:24:05.337920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import pgvector
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c2d8e61f05'
+down_revision: Union[str, Sequence[str], None] = '8e3f0a6c41b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embedding_cache',
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=False),
+    sa.Column('hits', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('model', 'text_hash')
+    )
+    op.create_index(op.f('ix_embedding_cache_last_used_at'), 'embedding_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_embedding_cache_last_used_at'), table_name='embedding_cache')
+    op.drop_table('embedding_cache')
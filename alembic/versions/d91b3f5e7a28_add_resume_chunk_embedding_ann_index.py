@@ -0,0 +1,44 @@
+"""Add ANN index on resume_chunks.embedding
+
+Revision ID: d91b3f5e7a28
+Revises: a4c2d8e61f05
+Create Date: 2026-10-18 13:40:52.106448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91b3f5e7a28'
+down_revision: Union[str, Sequence[str], None] = 'a4c2d8e61f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fixed definition (HNSW, pgvector defaults) so every environment gets the
+    # same schema; other index types/parameters are built with
+    # `python -m ingestion.build_ann_index`. CONCURRENTLY keeps resume_chunks
+    # writable during the build and cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_resume_chunks_embedding_ann', 'resume_chunks', ['embedding'], unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_resume_chunks_embedding_ann', table_name='resume_chunks',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,58 @@
+"""Add full-text search column and GIN index to resume_chunks
+
+Adding the STORED generated column rewrites resume_chunks under an ACCESS
+EXCLUSIVE lock, so searches and ingestion wait for it: on a large corpus run
+it in a maintenance window. The GIN index is then built CONCURRENTLY.
+
+Revision ID: f2a6c0d4b913
+Revises: d91b3f5e7a28
+Create Date: 2026-10-18 15:08:33.720415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c0d4b913'
+down_revision: Union[str, Sequence[str], None] = 'd91b3f5e7a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'resume_chunks',
+        sa.Column(
+            'chunk_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', chunk_text)", persisted=True),
+            nullable=True
+        )
+    )
+    # CONCURRENTLY keeps resume_chunks writable during the build and cannot
+    # run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_resume_chunks_chunk_tsv',
+            'resume_chunks',
+            ['chunk_tsv'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_resume_chunks_chunk_tsv', table_name='resume_chunks',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('resume_chunks', 'chunk_tsv')
@@ -0,0 +1,114 @@
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+from sqlalchemy import text as sql_text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.embedding_cache import normalize_text
+
+CONTEXT_ENCODING = "o200k_base"  # gpt-4o family tokenizer
+# Shortest shared suffix/prefix treated as chunk overlap rather than coincidence
+MIN_OVERLAP_CHARS = 20
+
+
+RESUME_TEXTS_SQL = sql_text("SELECT id, text_md FROM resumes WHERE id = ANY(:resume_ids)")
+
+
+@lru_cache(maxsize=None)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(CONTEXT_ENCODING)
+    except Exception:
+        # offline / no BPE files: ~4 characters per token is close enough for budgeting
+        return None
+
+
+def token_counter() -> Callable[[str], int]:
+    enc = _encoding()
+    if enc is None:
+        return lambda s: len(s) // 4 + 1
+    return lambda s: len(enc.encode(s, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    enc = _encoding()
+    if enc is None:
+        return text[:max_tokens * 4]
+    tokens = enc.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else enc.decode(tokens[:max_tokens])
+
+
+async def load_resume_texts(db: AsyncSession, resume_ids: List[int]) -> Dict[int, str]:
+    """Full resume markdown by id, for the few places that need more than snippets."""
+    if not resume_ids:
+        return {}
+    result = await db.execute(RESUME_TEXTS_SQL, {"resume_ids": list(resume_ids)})
+    return dict(result.all())
+
+
+def _trim_overlap(previous: str, text: str) -> str:
+    """
+    Drop the part of `text` that repeats `previous` through chunk overlap.
+    Snippets arrive in score order, not document order, so `text` may be the
+    chunk just after `previous` (shared head) or just before it (shared tail).
+    """
+    longest = min(len(previous), len(text))
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(text[:size]):
+            return text[size:].lstrip()
+        if previous.startswith(text[-size:]):
+            return text[:-size].rstrip()
+    return text
+
+
+def resume_header(match: Dict) -> str:
+    employee = match.get("employee") or {}
+    role = f", {employee['role']}" if employee.get("role") else ""
+    return f"### {employee.get('name', 'Unknown')}{role} ({match.get('file_path', '')})"
+
+
+def build_context(matches: List[Dict], max_tokens: int) -> str:
+    """
+    Pack search-match snippets into a prompt context of at most `max_tokens`.
+
+    Matches come ranked best-first, each with its snippets best-first, so
+    snippets are taken round-robin by rank: every resume's best snippet
+    before any resume's second. Exact duplicates are dropped and text that
+    repeats a neighbouring chunk's overlap is trimmed. Output is grouped
+    per resume under a header line.
+    """
+    count = token_counter()
+    used = 0
+    seen = set()
+    picked: Dict[int, List[str]] = {}
+    header_cost = {i: count(resume_header(m)) + 2 for i, m in enumerate(matches)}
+
+    depth = max((len(m.get("snippets") or []) for m in matches), default=0)
+    for rank in range(depth):
+        for i, match in enumerate(matches):
+            snippets = match.get("snippets") or []
+            if rank >= len(snippets):
+                continue
+            text = snippets[rank]["text"]
+            key = normalize_text(text)
+            if key in seen:
+                continue
+            for previous in picked.get(i, []):
+                text = _trim_overlap(previous, text)
+            if not text.strip():
+                continue
+
+            cost = count(text) + 1 + (0 if i in picked else header_cost[i])
+            if used + cost > max_tokens:
+                continue
+            seen.add(key)
+            picked.setdefault(i, []).append(text)
+            used += cost
+
+    blocks = []
+    for i, match in enumerate(matches):
+        if i in picked:
+            blocks.append(resume_header(match) + "\n" + "\n".join(picked[i]))
+    return "\n\n".join(blocks)
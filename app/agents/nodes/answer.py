@@ -1,7 +1,10 @@
 from langchain_openai import ChatOpenAI
 from app.agents.state import AgentState
+from app.agents.context import build_context
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2, cache=llm_cache("generate_answer"))
 
 ANSWER_PROMPT = """
 You are an HR intelligence agent.
@@ -21,7 +24,7 @@ Return a structured JSON with:
 - actions_suggested
 """
 
-def generate_answer(state: AgentState):
+async def generate_answer(state: AgentState):
 
     if state.get("calendar_info"):
         # Convert calendar info dict to natural language string
@@ -44,6 +47,11 @@ def generate_answer(state: AgentState):
         talent_gap_data = state["talent_gap"]
         if isinstance(talent_gap_data, dict):
             state["answer"] = f"Talent Gap Analysis:\n\n{talent_gap_data.get('analysis', str(talent_gap_data))}"
+            if talent_gap_data.get("pool_truncated"):
+                state["answer"] += (
+                    f"\n\nNote: only the {talent_gap_data['resumes_analyzed']} resumes closest to the "
+                    f"query were analyzed; more matched (TALENT_GAP_POOL_SIZE)."
+                )
         else:
             state["answer"] = str(talent_gap_data)
         return state
@@ -59,16 +67,16 @@ def generate_answer(state: AgentState):
                 answer_parts = ["Resume Summaries:\n"]
                 for item in summaries:
                     emp_name = item.get("employee", {}).get("name", "Unknown")
-                    summary = item.get("summary", "No summary available")
+                    summary = item.get("summary") or "No summary available (generation failed or timed out)"
                     answer_parts.append(f"\n**{emp_name}**\n{summary}\n")
                 state["answer"] = "\n".join(answer_parts)
         else:
             state["answer"] = str(structured)
         return state
 
-    context = "\n\n".join(state.get("retrieved_chunks", []))
+    context = build_context(state.get("resumes", []), settings.agent_context_max_tokens)
 
-    response = llm.invoke(
+    response = await llm.ainvoke(
         ANSWER_PROMPT.format(
             query=state["query"],
             context=context
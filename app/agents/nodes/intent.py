@@ -1,7 +1,20 @@
+import re
+from typing import Dict, Optional, Tuple
+
 from langchain_openai import ChatOpenAI
 from app.agents.state import AgentState
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
+
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, cache=llm_cache("classify_intent"))
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+INTENTS = (
+    "resume_search",
+    "resume_summary",
+    "availability_check",
+    "general_hr_query",
+    "talent_gap_analysis",
+)
 
 INTENT_PROMPT = """
 Classify the user query into one of the following intents:
@@ -15,8 +28,83 @@ Return only the intent string.
 Query: {query}
 """
 
-def classify_intent(state: AgentState):
-    response = llm.invoke(INTENT_PROMPT.format(query=state["query"]))
-    print('intent-----', response.content)
-    state["intent"] = response.content.strip()
+# Fast path: weighted keyword rules. Strong cues weigh 3, supporting cues 1;
+# a query is only classified locally when one intent clearly wins.
+INTENT_RULES = {
+    "availability_check": [
+        (r"\b(available|availability|busy|calendar|time ?slots?)\b", 3),
+        # "free" only with a time cue ("free-text", "free software" are not availability)
+        (r"\bfree (on|at|this|next|tomorrow|today|tonight|between|after|before|to (meet|talk|chat)"
+         r"|for (a )?(call|chat|meeting|interview)|in the (morning|afternoon|evening))\b", 3),
+        (r"\b(is|are) \w+ free\b(?!-)", 1),
+        (r"\b(when (is|are|can)|schedule|book|meet(ing)?|interview)\b", 1),
+    ],
+    "resume_summary": [
+        (r"\b(summar(y|ies|ise|ize|ising|izing)|overview|tl;?dr|synopsis)\b", 3),
+        (r"\b(brief|highlights?|describe)\b", 1),
+    ],
+    "talent_gap_analysis": [
+        (r"\b(skills?|talent|capabilit(y|ies)|competenc(y|ies)) gaps?\b", 3),
+        (r"\bgap analysis\b|\b(upskill(ing)?|reskill(ing)?|training needs)\b", 3),
+        (r"\b(gaps?|missing|lack(ing)?|learnings?)\b", 1),
+    ],
+    "resume_search": [
+        (r"\b(find|search|list|show|look(ing)? for|who (has|have|knows?))\b", 1),
+        (r"\b(resumes?|cvs?|candidates?|profiles?|top \d+)\b", 1),
+        (r"\b(experience|experienced|familiar|skilled|worked) (in|with|on)\b", 1),
+    ],
+    "general_hr_query": [
+        (r"\b(polic(y|ies)|leave|vacation|holidays?|pto|payroll|benefits?|onboarding|handbook)\b", 3),
+    ],
+}
+COMPILED_RULES = {
+    intent: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in rules]
+    for intent, rules in INTENT_RULES.items()
+}
+
+
+def rule_scores(query: str) -> Dict[str, int]:
+    return {
+        intent: sum(weight for pattern, weight in rules if pattern.search(query))
+        for intent, rules in COMPILED_RULES.items()
+    }
+
+
+def fast_classify(query: str) -> Tuple[Optional[str], int]:
+    """
+    Intent from keyword rules and its margin over the runner-up, or
+    (None, margin) when no intent wins by `intent_fast_path_margin`.
+    """
+    ranked = sorted(rule_scores(query).items(), key=lambda kv: kv[1], reverse=True)
+    (best, best_score), (_, runner_up) = ranked[0], ranked[1]
+    margin = best_score - runner_up
+    if best_score and margin >= settings.intent_fast_path_margin:
+        return best, margin
+    return None, margin
+
+
+def parse_intent(content: str) -> str:
+    intent = content.strip()
+    # route_intent sends anything unknown to RAG, same as resume_search
+    return intent if intent in INTENTS else "resume_search"
+
+
+def llm_classify(query: str) -> str:
+    return parse_intent(llm.invoke(INTENT_PROMPT.format(query=query)).content)
+
+
+async def allm_classify(query: str) -> str:
+    return parse_intent((await llm.ainvoke(INTENT_PROMPT.format(query=query))).content)
+
+
+async def classify_intent(state: AgentState):
+    intent = None
+    if settings.intent_fast_path_enabled:
+        intent, margin = fast_classify(state["query"])
+    if intent is None:
+        intent = await allm_classify(state["query"])
+        print('intent (llm)-----', intent)
+    else:
+        print(f'intent (rules, margin {margin})-----', intent)
+    state["intent"] = intent
     return state
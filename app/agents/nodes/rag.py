@@ -1,13 +1,8 @@
 from app.agents.state import AgentState
 from app.agents.tools.resume_search import resume_search_tool
-from db.session import get_db
+from db.session import AsyncSessionLocal
 
-def rag_search_node(state: AgentState):
-    db = next(get_db())
-    results = resume_search_tool(db, state["query"], top_k=5)
-
-    state["resumes"] = results
-    state["retrieved_chunks"] = [
-        r["resume_text"] for r in results if r.get("resume_text")
-    ]
+async def rag_search_node(state: AgentState):
+    async with AsyncSessionLocal() as db:
+        state["resumes"] = await resume_search_tool(db, state["query"], top_k=5)
     return state
@@ -1,23 +1,22 @@
-
 from app.agents.state import AgentState
-from app.agents.tools.resume_summary_tool import resume_summary_tool
+from app.agents.tools.resume_summary_tool import resume_summaries_tool
 from app.agents.tools.resume_search import resume_search_tool
-from db.session import get_db
+from db.session import AsyncSessionLocal
 
-def resume_summary_node(state: AgentState):
-    # First, search for resumes if not already populated
-    if not state.get("resumes"):
-        db = next(get_db())
-        results = resume_search_tool(db, state["query"], top_k=5)
-        state["resumes"] = results
+async def resume_summary_node(state: AgentState):
+    async with AsyncSessionLocal() as db:
+        # First, search for resumes if not already populated
+        if not state.get("resumes"):
+            results = await resume_search_tool(db, state["query"], top_k=5)
+            state["resumes"] = results
 
-    # Generate summaries for found resumes
-    summaries = []
-    for r in state["resumes"]:
-        summaries.append({
-            "employee": r["employee"],
-            "summary": resume_summary_tool(r["resume_text"])
-        })
+        # Stored summaries first; the rest are generated concurrently (failures → None)
+        summaries = []
+        for r, summary in zip(state["resumes"], await resume_summaries_tool(db, state["resumes"])):
+            summaries.append({
+                "employee": r["employee"],
+                "summary": summary,
+            })
 
     state["structured_output"] = {"resume_summaries": summaries}
     return state
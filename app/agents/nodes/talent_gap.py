@@ -1,10 +1,30 @@
-
 from app.agents.state import AgentState
-from app.agents.tools.talent_gap_tool import talent_gap_tool
+from app.agents.tools.resume_search import resume_search_tool
+from app.agents.tools.talent_gap_tool import skills_matrix_gap, talent_gap_tool
+from app.core.config import settings
+from db.session import AsyncSessionLocal
+
+async def talent_gap_node(state: AgentState):
+    async with AsyncSessionLocal() as db:
+        # Recognized skills are answered from the skills matrix in SQL
+        if settings.skills_matrix_enabled:
+            state["talent_gap"] = await skills_matrix_gap(db, state["query"])
+            if state["talent_gap"]:
+                return state
 
-def talent_gap_node(state: AgentState):
-    state["talent_gap"] = talent_gap_tool(
-        query=state["query"],
-        resumes=state["resumes"]
-    )
+        # The intent routes here directly, so gather the candidate pool first;
+        # one extra match tells a full pool apart from a truncated one
+        pool_truncated = False
+        if not state.get("resumes"):
+            pool = await resume_search_tool(
+                db, state["query"], top_k=settings.talent_gap_pool_size + 1
+            )
+            pool_truncated = len(pool) > settings.talent_gap_pool_size
+            state["resumes"] = pool[:settings.talent_gap_pool_size]
+        state["talent_gap"] = await talent_gap_tool(
+            db,
+            query=state["query"],
+            resumes=state["resumes"],
+            pool_truncated=pool_truncated,
+        )
     return state
@@ -1,9 +1,15 @@
 from typing import Dict, List, Optional, TypedDict, Any
 
+# Tag for LLM calls inside a streamed node whose output is not the answer
+# (e.g. concurrent map steps); stream_agent drops their tokens
+NO_STREAM_TAG = "no_stream"
+
 class AgentState(TypedDict):
     query: str
     intent: str
-    retrieved_chunks: List[str]
+    # Search matches as references: resume_id, employee, file_path, score and
+    # best-matching snippets. Full resume text is never carried in state;
+    # nodes that need it load it by resume_id.
     resumes: List[dict]
     calendar_info: Optional[Dict[str, Any]]
     talent_gap: Optional[Dict[str, Any]]
@@ -0,0 +1,63 @@
+from typing import AsyncIterator, Dict
+
+from app.agents.hr_agent import hr_agent
+from app.agents.state import NO_STREAM_TAG, AgentState
+
+# Progress text shown while a node runs
+NODE_LABELS = {
+    "classify_intent": "Understanding your question",
+    "rag": "Searching resumes",
+    "check_availability": "Checking calendars",
+    "create_summary": "Summarizing resumes",
+    "generate_talent_gap": "Analyzing skill gaps",
+    "generate_answer": "Writing the answer",
+}
+
+# Nodes whose LLM output is (the bulk of) the final answer, so their tokens
+# are worth showing as they arrive; calls tagged NO_STREAM_TAG are skipped
+STREAMED_NODES = ("generate_answer", "generate_talent_gap")
+
+
+def initial_state(query: str) -> AgentState:
+    return {
+        "query": query,
+        "intent": "",
+        "resumes": [],
+        "calendar_info": None,
+        "talent_gap": None,
+        "answer": None,
+        "structured_output": None,
+    }
+
+
+async def stream_agent(query: str) -> AsyncIterator[Dict]:
+    """
+    Runs the HR agent and yields progress as it happens:
+      {"event": "node", "node", "label", "status": "start"|"end"}
+      {"event": "intent", "intent"}
+      {"event": "token", "node", "content"}   answer tokens as generated
+      {"event": "answer", "answer", "intent"} final, authoritative answer
+    Nodes may call the LLM with plain invoke(): under astream_events chat
+    models stream through the callbacks anyway.
+    """
+    async for event in hr_agent.astream_events(initial_state(query), version="v2"):
+        kind = event["event"]
+        name = event["name"]
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chat_model_stream":
+            if node not in STREAMED_NODES or NO_STREAM_TAG in event.get("tags", []):
+                continue
+            content = event["data"]["chunk"].content
+            if content:
+                yield {"event": "token", "node": node, "content": content}
+
+        elif kind in ("on_chain_start", "on_chain_end") and name in NODE_LABELS and node == name:
+            status = "start" if kind == "on_chain_start" else "end"
+            yield {"event": "node", "node": name, "label": NODE_LABELS[name], "status": status}
+            if name == "classify_intent" and status == "end":
+                yield {"event": "intent", "intent": event["data"]["output"]["intent"]}
+
+        elif kind == "on_chain_end" and event.get("parent_ids") == []:
+            result = event["data"]["output"]
+            yield {"event": "answer", "answer": result.get("answer"), "intent": result.get("intent")}
@@ -1,10 +1,12 @@
-from sqlalchemy.orm import Session
-from app.services.semantic_search import SemanticSearchService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.services.semantic_search import AsyncSemanticSearchService
 
-def resume_search_tool(
-    db: Session,
+async def resume_search_tool(
+    db: AsyncSession,
     query: str,
     top_k: int = 5
 ):
-    service = SemanticSearchService(db)
-    return service.search(query=query, top_k=top_k)
+    service = AsyncSemanticSearchService(db)
+    # Snippets only: prompts are packed from them under a token budget
+    return await service.search(query=query, top_k=top_k, snippets=settings.agent_context_snippets)
@@ -1,18 +1,45 @@
+from typing import Dict, List, Optional
 
-from langchain_openai import ChatOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+from app.services.resume_summaries import (
+    SUMMARY_MODEL,
+    SUMMARY_PROMPT_VERSION,
+    ResumeSummaryStore,
+    agenerate_summaries,
+)
+from db.session import release_connection
 
-SUMMARY_PROMPT = """
-Summarize the following resume focusing on:
-- Key skills
-- Experience level
-- Best-fit roles
 
-Resume:
-{text}
-"""
+async def resume_summaries_tool(db: AsyncSession, resumes: List[Dict]) -> List[Optional[str]]:
+    """
+    Summaries for search results (by resume_id), read through the
+    resume_summaries table: only resumes without a summary of their current
+    content are sent to the LLM, and those results are stored. Full text is
+    loaded (in the same lookup query) for those misses only.
+    """
+    def store(session: Session) -> ResumeSummaryStore:
+        return ResumeSummaryStore(session, SUMMARY_PROMPT_VERSION, SUMMARY_MODEL)
 
-def resume_summary_tool(resume_text: str):
-    response = llm.invoke(SUMMARY_PROMPT.format(text=resume_text))
-    return response.content
+    stored = await db.run_sync(
+        lambda session: store(session).lookup([r["resume_id"] for r in resumes], include_text=True)
+    )
+
+    summaries = [stored.get(r["resume_id"], {}).get("summary") for r in resumes]
+    # a resume gone since the search has nothing to summarize
+    missing = [i for i, s in enumerate(summaries) if s is None and resumes[i]["resume_id"] in stored]
+    await release_connection(db)
+    generated = await agenerate_summaries([stored[resumes[i]["resume_id"]]["text_md"] for i in missing])
+
+    rows = []
+    for i, summary in zip(missing, generated):
+        summaries[i] = summary
+        row = stored.get(resumes[i]["resume_id"])
+        if summary is not None and row is not None:
+            rows.append((row["resume_id"], row["content_hash"], summary))
+    if rows:
+        await db.run_sync(lambda session: store(session).put_many(rows))
+        await db.commit()
+    print(f"Resume summaries: {len(resumes) - len(missing)} stored, {len(missing)} generated")
+    return summaries
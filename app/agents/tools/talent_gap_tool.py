@@ -1,7 +1,19 @@
+from typing import List, Tuple
 
 from langchain_openai import ChatOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+from app.agents.context import build_context, load_resume_texts, resume_header, token_counter, truncate_tokens
+from app.agents.state import NO_STREAM_TAG
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from app.services.skills import best_matches, get_skill_matcher, profiled_employees, skill_coverage
+from db.session import release_connection
+
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, cache=llm_cache("talent_gap"))
+# Map and merge calls run concurrently inside the streamed node: their tokens
+# would interleave, so only the final (single or reduce) call streams
+background_llm = llm.with_config(tags=[NO_STREAM_TAG])
 
 GAP_PROMPT = """
 You are an HR strategist.
@@ -18,11 +30,252 @@ Resumes:
 {context}
 """
 
-def talent_gap_tool(query: str, resumes: list):
-    context = "\n\n".join([r["resume_text"] for r in resumes])
-    response = llm.invoke(GAP_PROMPT.format(query=query, context=context))
+# Map step: one call per batch of resumes, run concurrently
+SKILLS_PROMPT = """
+You are an HR analyst.
+
+For each person below, list in a few short bullets:
+- Core skills and technologies
+- Seniority
+- Skills relevant to the role requirement that they lack
+
+Role Requirement:
+{query}
+
+Resumes:
+{context}
+"""
+
+# Reduce step: one call over all per-batch findings
+REDUCE_PROMPT = """
+You are an HR strategist.
+
+Below are skill findings for {count} people, extracted batch by batch.
+Aggregate them against the role requirement and identify:
+- Missing skills (across the whole group, noting how widespread each gap is)
+- Weak areas
+- Hiring recommendations
 
+Role Requirement:
+{query}
+
+Findings:
+{context}
+"""
+
+# Intermediate reduce: merges a group of findings when all of them do not fit
+# one REDUCE_PROMPT call
+MERGE_PROMPT = """
+You are an HR analyst.
+
+Below are skill findings for {count} people, extracted batch by batch.
+Merge them into one set of findings for the role requirement: the skills
+present and lacking across the group, noting how many people each applies to,
+and the most notable individuals. Keep it concise.
+
+Role Requirement:
+{query}
+
+Findings:
+{context}
+"""
+
+FINDINGS_SEPARATOR = "\n\n---\n\n"
+
+# Skills-matrix path: the numbers come from SQL, the LLM only writes them up
+MATRIX_PROMPT = """
+You are an HR strategist.
+
+Below is skill coverage across the workforce, computed from the skills
+matrix, for the skills a role requirement needs. Using only these numbers,
+write up:
+- Missing skills (nobody has them)
+- Weak areas (few people, or no senior people)
+- Hiring recommendations (and who could be upskilled, from the best matches)
+
+Role Requirement:
+{query}
+
+Skills Matrix:
+{facts}
+"""
+
+async def talent_gap_tool(db: AsyncSession, query: str, resumes: list, pool_truncated: bool = False):
+    """
+    Small pools go to the LLM in one call built from search snippets. Pools
+    larger than `talent_gap_batch_size` are map-reduced: skills are extracted
+    per batch of resumes concurrently, then aggregated under a token budget.
+    `pool_truncated` (more resumes matched than were searched for) is passed
+    through so the answer can say the analysis is partial.
+    """
+    if len(resumes) <= settings.talent_gap_batch_size:
+        context = build_context(resumes, settings.talent_gap_context_max_tokens)
+        response = await llm.ainvoke(GAP_PROMPT.format(query=query, context=context))
+        analysis, mode, failed = response.content, "single", 0
+    else:
+        analysis, failed = await map_reduce_gap(db, query, resumes)
+        mode = "map_reduce"
+
+    return {
+        "analysis": analysis,
+        "recommendation": "Consider hiring or upskilling",
+        "resumes_analyzed": len(resumes),
+        "mode": mode,
+        "batches_failed": failed,
+        "pool_truncated": pool_truncated,
+    }
+
+
+async def skills_matrix_gap(db: AsyncSession, query: str):
+    """
+    Gap analysis from employee_skills aggregates. Returns None when the
+    matcher recognizes no skill in the query or no resume has extracted
+    skills yet, so the caller falls back to the resume-reading analysis.
+    """
+    required = list(get_skill_matcher().find(query))
+    if not required:
+        return None
+    total = await profiled_employees(db)
+    if not total:
+        return None
+    coverage = await skill_coverage(db, required)
+    matches = await best_matches(db, required)
+
+    missing = [s for s in required if s not in coverage]
+    weak = [
+        s for s, row in coverage.items()
+        if row["employees"] / total < settings.talent_gap_weak_coverage or not row["senior_employees"]
+    ]
+    lines = [f"Employees with extracted skills: {total}", "", "Coverage per required skill:"]
+    for skill in required:
+        row = coverage.get(skill)
+        if row is None:
+            lines.append(f"- {skill}: nobody")
+            continue
+        years = f", avg {float(row['avg_years'])} yrs experience" if row["avg_years"] is not None else ""
+        lines.append(
+            f"- {skill} ({row['category']}): {row['employees']} employees "
+            f"({row['employees'] / total:.0%}), {row['senior_employees']} senior{years}; "
+            f"e.g. {', '.join(row['top_people'])}"
+        )
+    lines += ["", f"Best matches (of {len(required)} required skills):"]
+    lines += [f"- {m['name']}: {m['matched']} ({', '.join(sorted(m['skills']))})" for m in matches]
+    print(f"Talent gap: skills matrix for {required} ({len(missing)} missing, {len(weak)} weak)")
+    await release_connection(db)
+
+    response = await llm.ainvoke(MATRIX_PROMPT.format(query=query, facts="\n".join(lines)))
     return {
         "analysis": response.content,
-        "recommendation": "Consider hiring or upskilling"
+        "recommendation": "Consider hiring or upskilling",
+        "resumes_analyzed": total,
+        "mode": "skills_matrix",
+        "batches_failed": 0,
+        "required_skills": required,
+        "missing_skills": missing,
+        "weak_skills": weak,
+        "coverage": {
+            s: {"employees": row["employees"], "senior_employees": row["senior_employees"]}
+            for s, row in coverage.items()
+        },
     }
+
+
+async def map_reduce_gap(db: AsyncSession, query: str, resumes: list):
+    texts = await load_resume_texts(db, [r["resume_id"] for r in resumes])
+    await release_connection(db)
+    size = settings.talent_gap_batch_size
+    batches = [resumes[i:i + size] for i in range(0, len(resumes), size)]
+
+    prompts = []
+    for batch in batches:
+        context = "\n\n".join(
+            resume_header(r) + "\n" + truncate_tokens(texts.get(r["resume_id"], ""), settings.talent_gap_resume_max_tokens)
+            for r in batch
+        )
+        prompts.append(SKILLS_PROMPT.format(query=query, context=context))
+
+    responses = await background_llm.abatch(
+        prompts,
+        config={"max_concurrency": settings.talent_gap_concurrency},
+        return_exceptions=True,
+    )
+    findings = []
+    failed = 0
+    for batch, response in zip(batches, responses):
+        if isinstance(response, Exception):
+            print(f"Talent gap map step failed: {response!r}")
+            failed += 1
+        else:
+            findings.append((len(batch), response.content))
+    print(f"Talent gap: {len(resumes)} resumes in {len(batches)} batches ({failed} failed)")
+    if not findings:
+        return "Talent gap analysis failed: none of the resume batches could be analyzed.", failed
+
+    findings = await merge_findings(query, findings)
+    response = await llm.ainvoke(REDUCE_PROMPT.format(
+        query=query,
+        count=sum(n for n, _ in findings),
+        context=FINDINGS_SEPARATOR.join(text for _, text in findings),
+    ))
+    return response.content, failed
+
+
+def group_findings(findings: List[Tuple[int, str]], max_tokens: int) -> List[List[Tuple[int, str]]]:
+    """Consecutive findings packed into groups of at most `max_tokens`."""
+    count = token_counter()
+    separator = count(FINDINGS_SEPARATOR)
+    groups, used = [], 0
+    for finding in findings:
+        cost = count(finding[1]) + separator
+        if not groups or used + cost > max_tokens:
+            groups.append([])
+            used = 0
+        groups[-1].append(finding)
+        used += cost
+    return groups
+
+
+async def merge_findings(query: str, findings: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    """
+    Hierarchical reduce: while the (people, findings) pairs do not fit one
+    call of `talent_gap_reduce_max_tokens`, merge them group by group. Each
+    finding is capped at a third of the budget (slack for the tokenizer
+    round-trip), so every group holds at least two and each round at least
+    halves the count.
+    """
+    budget = settings.talent_gap_reduce_max_tokens
+    cap = max(1, budget // 3)
+    findings = [(n, truncate_tokens(text, cap)) for n, text in findings]
+    rounds = 0
+    while len(findings) > 1:
+        groups = group_findings(findings, budget)
+        # one group fits the reduce call; one per finding could never shrink
+        if len(groups) == 1 or len(groups) == len(findings):
+            break
+        responses = await background_llm.abatch(
+            [
+                MERGE_PROMPT.format(
+                    query=query,
+                    count=sum(n for n, _ in group),
+                    context=FINDINGS_SEPARATOR.join(text for _, text in group),
+                )
+                for group in groups
+            ],
+            config={"max_concurrency": settings.talent_gap_concurrency},
+            return_exceptions=True,
+        )
+        merged = []
+        for group, response in zip(groups, responses):
+            people = sum(n for n, _ in group)
+            if isinstance(response, Exception):
+                # keep the group's findings, cut to one finding's share
+                print(f"Talent gap merge step failed: {response!r}")
+                text = FINDINGS_SEPARATOR.join(t for _, t in group)
+            else:
+                text = response.content
+            merged.append((people, truncate_tokens(text, cap)))
+        findings = merged
+        rounds += 1
+    if rounds:
+        print(f"Talent gap: findings merged in {rounds} round(s)")
+    return findings
@@ -0,0 +1,90 @@
+import os
+import shutil
+from typing import List
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.ingestion_jobs import job_manager, new_job_id
+from ingestion.document_reader import SUPPORTED_EXTENSIONS
+
+router = APIRouter(prefix="/ingest", tags=["Ingestion"])
+
+
+class IngestPathsRequest(BaseModel):
+    paths: List[str]
+
+
+def resolve_paths(paths: List[str]) -> List[str]:
+    """Expand directories and reject anything outside the ingestion source root."""
+    root = os.path.realpath(settings.ingest_source_root)
+    files = []
+    for p in paths:
+        real = os.path.realpath(p)
+        if os.path.commonpath([root, real]) != root:
+            raise HTTPException(status_code=400, detail=f"Path outside {settings.ingest_source_root}: {p}")
+        if os.path.isdir(real):
+            for dirpath, _, names in os.walk(real):
+                files.extend(
+                    os.path.join(dirpath, n) for n in sorted(names)
+                    if n.lower().endswith(SUPPORTED_EXTENSIONS)
+                )
+        elif os.path.isfile(real) and real.lower().endswith(SUPPORTED_EXTENSIONS):
+            files.append(real)
+        else:
+            raise HTTPException(status_code=400, detail=f"Not a supported file or directory: {p}")
+
+    # Store paths relative to the working directory, like the CLI does
+    return [os.path.relpath(f) for f in files]
+
+
+@router.post("", status_code=202)
+def ingest_paths(payload: IngestPathsRequest):
+    files = resolve_paths(payload.paths)
+    if not files:
+        raise HTTPException(status_code=400, detail="No supported files found")
+    return job_manager.submit(files).to_dict()
+
+
+@router.post("/upload", status_code=202)
+def ingest_upload(files: List[UploadFile] = File(...)):
+    # validate every name before writing anything
+    names = []
+    for upload in files:
+        name = os.path.basename(upload.filename or "")
+        if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {upload.filename}")
+        if name in names:
+            raise HTTPException(status_code=400, detail=f"Duplicate file name: {upload.filename}")
+        names.append(name)
+
+    # Bytes are staged in one directory per job, so an upload never overwrites
+    # a file a running job is reading; the resume is stored under the stable
+    # INGEST_UPLOAD_DIR/<name>, so re-uploading a file replaces its resume
+    job_id = new_job_id()
+    staging_dir = os.path.join(settings.ingest_upload_dir, job_id)
+    os.makedirs(staging_dir, exist_ok=True)
+
+    staged, stored_paths = [], {}
+    for upload, name in zip(files, names):
+        path = os.path.join(staging_dir, name)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(upload.file, out)
+        staged.append(path)
+        stored_paths[path] = os.path.join(settings.ingest_upload_dir, name)
+
+    return job_manager.submit(staged, job_id, stored_paths).to_dict()
+
+
+@router.get("")
+def list_jobs():
+    return {"jobs": [job.to_dict() for job in job_manager.list()]}
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
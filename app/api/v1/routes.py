@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from . import search
+from . import ingest, search
 
 
 router = APIRouter()
 
 
-router.include_router(search.router)
\ No newline at end of file
+router.include_router(search.router)
+router.include_router(ingest.router)
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from typing import List, Optional
 
-from db.session import get_db
-from app.services.semantic_search import SemanticSearchService
+import orjson
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import get_async_db
+from app.core.config import settings
+from app.services.semantic_search import (
+    HNSW_MAX_EF_SEARCH, SEARCH_MODES, AsyncSemanticSearchService, decode_cursor,
+)
+from app.services.embedding_cache import embedding_cache_stats
+from app.services.embeddings import query_embedding_cache
+from app.services.search_cache import search_result_cache
+from app.services.llm_cache import llm_cache_stats
 from app.agents.hr_agent import hr_agent
+from app.agents.streaming import initial_state, stream_agent
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
@@ -12,42 +24,134 @@ router = APIRouter(prefix="/search", tags=["Search"])
 class SemanticSearchRequest(BaseModel):
     query: str
     top_k: int = 5
+    mode: str = "vector"  # "vector", "keyword" (no embedding call) or "hybrid"
+    # ANN recall knobs; default to settings.vector_ef_search / vector_probes
+    ef_search: Optional[int] = Field(default=None, ge=1, le=HNSW_MAX_EF_SEARCH)
+    probes: Optional[int] = Field(default=None, ge=1, le=settings.vector_index_lists)
+    # Payload shaping: matched-chunk snippets by default, full markdown on request
+    snippets: int = 3
+    include_text: bool = False
+    fields: Optional[List[str]] = None  # subset of MATCH_FIELDS, default all
+    cursor: Optional[str] = None  # next_cursor from the previous page
+
+MATCH_FIELDS = {"resume_id", "score", "employee", "file_path", "snippets", "resume_text", "cursor"}
+
+class BatchSemanticSearchRequest(BaseModel):
+    queries: List[str]
+    top_k: int = 5
+    ef_search: Optional[int] = Field(default=None, ge=1, le=HNSW_MAX_EF_SEARCH)
+    probes: Optional[int] = Field(default=None, ge=1, le=settings.vector_index_lists)
+    snippets: int = 3
+    include_text: bool = False
 
 class RAGAgentRequest(BaseModel):
     query: str
 
 
 @router.post("/semantic")
-def semantic_search(
+async def semantic_search(
     payload: SemanticSearchRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    service = SemanticSearchService(db)
+    if payload.mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {SEARCH_MODES}")
+    if payload.fields and not set(payload.fields) <= MATCH_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(set(payload.fields) - MATCH_FIELDS)}")
+    if payload.cursor:
+        try:
+            decode_cursor(payload.cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    service = AsyncSemanticSearchService(db)
 
-    results = service.search(
+    results = await service.search(
         query=payload.query,
         top_k=payload.top_k,
+        ef_search=payload.ef_search,
+        probes=payload.probes,
+        include_text=payload.include_text or "resume_text" in (payload.fields or []),
+        snippets=payload.snippets,
+        cursor=payload.cursor,
+        mode=payload.mode,
     )
+    next_cursor = results[-1]["cursor"] if len(results) == payload.top_k else None
+
+    if payload.fields:
+        results = [{k: m[k] for k in payload.fields if k in m} for m in results]
 
     return {
         "query": payload.query,
         "matches": results,
         "count": len(results),
+        "next_cursor": next_cursor,
     }
 
-@router.post("/rag-agent")
-def rag_agent_endpoint(req: RAGAgentRequest):
-    state = {
-        "query": req.query,
-        "intent": "",
-        "retrieved_chunks": [],
-        "resumes": [],
-        "calendar_info": None,
-        "answer": None,
-        "structured_output": None,
+@router.post("/semantic/batch")
+async def semantic_search_batch(
+    payload: BatchSemanticSearchRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not payload.queries:
+        raise HTTPException(status_code=400, detail="queries must not be empty")
+    if len(payload.queries) > settings.search_batch_max_queries:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.search_batch_max_queries} queries per batch",
+        )
+
+    service = AsyncSemanticSearchService(db)
+
+    results = await service.search_batch(
+        queries=payload.queries,
+        top_k=payload.top_k,
+        ef_search=payload.ef_search,
+        probes=payload.probes,
+        include_text=payload.include_text,
+        snippets=payload.snippets,
+    )
+
+    return {
+        "results": {
+            query: {"matches": matches, "count": len(matches)}
+            for query, matches in results.items()
+        },
+        "count": len(results),
     }
 
-    result = hr_agent.invoke(state)
+@router.get("/cache-stats")
+def cache_stats():
+    return {
+        "query_embeddings": query_embedding_cache.stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "search_results": search_result_cache.stats(),
+        "llm_responses": llm_cache_stats(),
+    }
+
+@router.post("/rag-agent")
+async def rag_agent_endpoint(req: RAGAgentRequest):
+    result = await hr_agent.ainvoke(initial_state(req.query))
     return {
         "answer": result["answer"]
     }
+
+async def agent_events(query: str):
+    try:
+        async for event in stream_agent(query):
+            yield f"event: {event['event']}\ndata: {orjson.dumps(event).decode()}\n\n"
+    except Exception as e:
+        # headers are already sent, so failures travel as an event
+        print(f"Error in agent stream: {e}")
+        yield f"event: error\ndata: {orjson.dumps({'event': 'error', 'error': str(e)}).decode()}\n\n"
+
+@router.post("/rag-agent/stream")
+async def rag_agent_stream_endpoint(req: RAGAgentRequest):
+    """
+    Server-sent events: node progress, answer tokens as they are generated,
+    then the final answer (see app.agents.streaming.stream_agent).
+    """
+    return StreamingResponse(
+        agent_events(req.query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
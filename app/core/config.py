@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,6 +10,103 @@ class Settings(BaseSettings):
 
     openai_api_key: str
 
+    # Async request path (AsyncSession): sessions release their connection
+    # (release_connection) before every LLM/embeddings await, so connections are
+    # held only while queries run and a small pool serves many conversations
+    db_async_pool_size: int = 20
+    db_async_max_overflow: int = 20
+
+    # Embedding cache (model + text hash → vector), oldest entries evicted past this size
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_rows: int = 1_000_000
+    # In-process LRU of query embeddings in front of the table above
+    query_embedding_cache_size: int = 10_000
+    query_embedding_cache_ttl: float = 3600.0
+
+    # ANN index on resume_chunks.embedding. Migrations build HNSW with the
+    # defaults below; other types/params: python -m ingestion.build_ann_index
+    vector_index_type: str = "hnsw"  # "hnsw" or "ivfflat"
+    vector_index_m: int = 16
+    vector_index_ef_construction: int = 64
+    vector_index_lists: int = 1000  # ivfflat: ~rows / 1000 up to 1M rows, sqrt(rows) beyond
+    # Compact candidate retrieval: index only a halfvec/binary form of the first
+    # vector_compact_dim dimensions, then rescore rescore_multiplier x the
+    # candidate window against the full vectors ("none" = full-precision index)
+    vector_compact_mode: str = "none"  # "none", "halfvec" or "binary"
+    vector_compact_dim: int = 1536
+    vector_rescore_multiplier: int = 4
+    # Query-time recall/latency knobs, overridable per request
+    vector_ef_search: int = 40
+    vector_probes: int = 10
+    # Two-stage search: nearest top_k * multiplier chunks, widened up to max when
+    # they collapse to fewer than top_k resumes (pgvector caps ef_search at 1000)
+    search_candidate_multiplier: int = 10
+    search_max_candidates: int = 1000
+    search_batch_max_queries: int = 100
+    # Hybrid search: reciprocal rank fusion of the vector and full-text legs
+    hybrid_rrf_k: int = 60
+    hybrid_vector_weight: float = 1.0
+    hybrid_keyword_weight: float = 1.0
+    # Vector-mode backend: "pgvector" (ANN index in Postgres) or "numpy"
+    # (memory-mapped exact search in-process, kept in sync by ingestion)
+    search_backend: str = "pgvector"
+    vector_index_dir: str = ".cache/vector_index"
+
+    # Search result cache, invalidated by the corpus version ingestion bumps
+    search_cache_enabled: bool = True
+    search_cache_max_bytes: int = 64 * 1024 * 1024
+    search_cache_ttl: float = 600.0
+    redis_url: Optional[str] = None  # shared tier across workers (pip install redis)
+
+    # Background ingestion jobs (/api/v1/ingest)
+    ingest_job_workers: int = 2  # jobs running at once
+    ingest_extract_workers: int = 2  # extraction processes per job
+    ingest_source_root: str = "source_files"  # path-based jobs must stay under this directory
+    ingest_upload_dir: str = "source_files/uploads"  # stored as <dir>/<name>, staged in <dir>/<job_id>/
+    # Finished jobs stay queryable this long (the registry is per process)
+    ingest_job_ttl: float = 24 * 3600.0
+    ingest_job_max_finished: int = 200
+
+    # Agent: keyword-rule intent classification before falling back to the LLM;
+    # a rule verdict is used when it beats the runner-up intent by this margin
+    intent_fast_path_enabled: bool = True
+    intent_fast_path_margin: int = 2
+    # Agent: per-resume summaries run concurrently; each item has its own
+    # deadline and failed items are reported without failing the answer.
+    # Every retry gets a fresh timeout, so keep retries at 0 or 1
+    summary_concurrency: int = 5
+    summary_timeout: float = 30.0
+    summary_max_retries: int = 0
+    # Ingestion stores summaries of new/changed resumes in resume_summaries
+    # (background pool), so summary requests are usually a DB lookup
+    summary_precompute_enabled: bool = True
+    summary_precompute_workers: int = 2
+    # Agent prompts are packed from search snippets under these token budgets
+    # instead of whole resumes
+    agent_context_snippets: int = 5  # snippets fetched per matched resume
+    agent_context_max_tokens: int = 3000
+    talent_gap_context_max_tokens: int = 6000
+    # Talent gap: pools above batch_size are map-reduced (per-batch skill
+    # extraction, `concurrency` calls in flight, then aggregating calls: findings
+    # over reduce_max_tokens are merged group by group until they fit one call)
+    talent_gap_pool_size: int = 50  # resumes searched when none are in state; larger pools are reported as truncated
+    talent_gap_batch_size: int = 5
+    talent_gap_concurrency: int = 10
+    talent_gap_resume_max_tokens: int = 2000  # per resume in the map step
+    talent_gap_reduce_max_tokens: int = 8000  # findings per reduce call
+    # Ingestion extracts skills into employee_skills (dictionary matcher over
+    # the taxonomy, plus an optional LLM pass); talent gap questions whose
+    # skills the matcher recognizes are answered from SQL aggregates
+    skills_taxonomy_path: Optional[str] = None  # JSON {skill: [category, [aliases]]}
+    skills_llm_enabled: bool = False
+    skills_matrix_enabled: bool = True
+    talent_gap_weak_coverage: float = 0.1  # share of profiled employees
+    # Exact-match LLM response cache shared by the agent nodes (SQLite file)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = ".cache/llm_cache.sqlite"
+    llm_cache_ttl: float = 7 * 24 * 3600.0
+    llm_cache_max_entries: int = 50_000
+
     class Config:
         env_file = ".env"
 
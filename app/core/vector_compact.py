@@ -0,0 +1,59 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.core.constants import VECTOR_DIM
+
+# Compact forms of resume_chunks.embedding used for candidate retrieval.
+# The first `vector_compact_dim` dimensions are kept (text-embedding-3 models
+# are Matryoshka-trained, so a prefix is itself a usable embedding), then
+#   halfvec: 16-bit floats, cosine distance (pgvector >= 0.7)
+#   binary:  one bit per dimension, hamming distance
+# The table keeps full float32 vectors, which rescore the compact shortlist.
+COMPACT_MODES = ("none", "halfvec", "binary")
+
+COMPACT_INDEX_OPS = {"halfvec": "halfvec_cosine_ops", "binary": "bit_hamming_ops"}
+COMPACT_DISTANCE_OPS = {"halfvec": "<=>", "binary": "<~>"}
+
+# Full-precision index (created by migration d91b3f5e7a28)
+FULL_INDEX_NAME = "ix_resume_chunks_embedding_ann"
+
+
+def compact_mode() -> str:
+    mode = settings.vector_compact_mode
+    if mode not in COMPACT_MODES:
+        raise ValueError(f"Unknown vector_compact_mode: {mode}")
+    return mode
+
+
+def compact_dim() -> int:
+    dim = settings.vector_compact_dim or VECTOR_DIM
+    if not 0 < dim <= VECTOR_DIM:
+        raise ValueError(f"vector_compact_dim must be between 1 and {VECTOR_DIM}")
+    return dim
+
+
+def ann_index_name(mode: Optional[str] = None, dim: Optional[int] = None) -> str:
+    """
+    Name of the index queries rely on in `mode`. Compact index names carry
+    mode and dim, so a configuration change points at a different (possibly
+    missing) index instead of silently reusing a mismatched one.
+    """
+    mode = mode or compact_mode()
+    if mode == "none":
+        return FULL_INDEX_NAME
+    return f"ix_resume_chunks_embedding_{mode}_{dim or compact_dim()}"
+
+
+def compact_expression(vector_sql: str, mode: Optional[str] = None, dim: Optional[int] = None) -> str:
+    """
+    SQL for the compact form of a vector expression. The index is built on
+    exactly this expression, so queries must use it verbatim to hit the index.
+    """
+    mode = mode or compact_mode()
+    dim = dim or compact_dim()
+    prefix = f"subvector({vector_sql}, 1, {dim})"
+    if mode == "halfvec":
+        return f"CAST({prefix} AS halfvec({dim}))"
+    if mode == "binary":
+        return f"CAST(binary_quantize({prefix}) AS bit({dim}))"
+    raise ValueError(f"No compact expression for mode: {mode}")
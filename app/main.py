@@ -1,8 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from app.api.v1.routes import router as api_router
+from app.core.config import settings
+from app.services.semantic_search import check_ann_index
+from db.session import SessionLocal
+
+
+def check_vector_index():
+    if settings.search_backend != "pgvector":
+        return
+    db = SessionLocal()
+    try:
+        if not db.execute(text("SELECT to_regclass('resume_chunks') IS NOT NULL")).scalar():
+            print("resume_chunks does not exist yet (run migrations); skipping ANN index check")
+            return
+        check_ann_index(db)
+    except SQLAlchemyError as e:
+        # database not reachable yet: searches will fail loudly on their own
+        print(f"Skipping ANN index check: {e}")
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_vector_index()
+    yield
 
 
-app = FastAPI(title="AI Resume Analyst API")
+app = FastAPI(title="AI Resume Analyst API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 
 @app.get("/health")
@@ -0,0 +1,137 @@
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from db.models.embedding_cache import EmbeddingCacheEntry
+
+# Check the table size (count(*)) only every N stored vectors
+EVICT_CHECK_EVERY = 1000
+
+EVICT_SQL = text("""
+    DELETE FROM embedding_cache
+    WHERE ctid IN (
+        SELECT ctid FROM embedding_cache
+        ORDER BY last_used_at ASC
+        LIMIT :excess
+    )
+""")
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+_stored_since_check = 0
+
+
+def normalize_text(text_: str) -> str:
+    return " ".join(text_.split())
+
+
+def text_hash(text_: str) -> str:
+    return hashlib.sha256(normalize_text(text_).encode("utf-8")).hexdigest()
+
+
+def embedding_cache_stats() -> Dict[str, float]:
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def _count(key: str, n: int):
+    with _lock:
+        _stats[key] += n
+
+
+class EmbeddingCache:
+    """
+    Read-through cache of embeddings in the `embedding_cache` table.
+    Callers own the transaction: nothing here commits.
+
+    With touch=False hits are read-only (no hit counter / recency update), so
+    the search path never turns a cache hit into a write; eviction recency
+    then comes from ingestion, and popular queries live in the in-process LRU.
+    """
+
+    def __init__(self, db: Session, model: str, touch: bool = True):
+        self.db = db
+        self.model = model
+        self.touch = touch
+        self.enabled = settings.embedding_cache_enabled
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Return cached vectors keyed by text hash; bumps hit counters/recency when touching."""
+        hashes = list({text_hash(t) for t in texts})
+        if not self.enabled or not hashes:
+            return {}
+
+        rows = self.db.query(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding).filter(
+            EmbeddingCacheEntry.model == self.model,
+            EmbeddingCacheEntry.text_hash.in_(hashes),
+        ).all()
+        found = {h: vec.tolist() for h, vec in rows}
+
+        if found and self.touch:
+            self.db.query(EmbeddingCacheEntry).filter(
+                EmbeddingCacheEntry.model == self.model,
+                EmbeddingCacheEntry.text_hash.in_(list(found)),
+            ).update(
+                {"hits": EmbeddingCacheEntry.hits + 1, "last_used_at": func.now()},
+                synchronize_session=False,
+            )
+
+        _count("hits", len(found))
+        _count("misses", len(hashes) - len(found))
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]):
+        """Store vectors keyed by text (not hash)."""
+        global _stored_since_check
+        if not self.enabled or not vectors:
+            return
+
+        rows = {text_hash(t): vec for t, vec in vectors.items()}
+        # executemany: one multi-VALUES statement would hit the 65535 bind parameter cap
+        self.db.execute(insert(EmbeddingCacheEntry).on_conflict_do_nothing(), [
+            {"model": self.model, "text_hash": h, "embedding": vec} for h, vec in rows.items()
+        ])
+        _count("stored", len(rows))
+
+        with _lock:
+            _stored_since_check += len(rows)
+            check = _stored_since_check >= EVICT_CHECK_EVERY
+            if check:
+                _stored_since_check = 0
+        if check:
+            self.evict()
+
+    def evict(self, max_rows: Optional[int] = None):
+        max_rows = max_rows if max_rows is not None else settings.embedding_cache_max_rows
+        size = self.db.query(func.count()).select_from(EmbeddingCacheEntry).scalar()
+        excess = size - max_rows
+        if excess > 0:
+            self.db.execute(EVICT_SQL, {"excess": excess})
+            _count("evicted", excess)
+
+    def embed_documents(self, embedder, texts: List[str]) -> List[List[float]]:
+        """Embed through the cache with `embedder` for misses only."""
+        cached = self.get_many(texts)
+        missing = list({normalize_text(t): t for t in texts if text_hash(t) not in cached}.values())
+        if missing:
+            fresh = dict(zip(missing, embedder.embed_documents(missing)))
+            self.put_many(fresh)
+            cached.update({text_hash(t): vec for t, vec in fresh.items()})
+        return [cached[text_hash(t)] for t in texts]
+
+    def embed_query(self, embedder, query: str) -> List[float]:
+        cached = self.get_many([query])
+        h = text_hash(query)
+        if h in cached:
+            return cached[h]
+        vec = embedder.embed_query(query)
+        self.put_many({query: vec})
+        return vec
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from langchain_openai import OpenAIEmbeddings
+
+from app.core.config import settings
+from app.core.constants import EMBED_MODEL
+from app.services.embedding_cache import normalize_text
+
+
+@lru_cache(maxsize=None)
+def get_embedder(model: str = EMBED_MODEL) -> OpenAIEmbeddings:
+    """Process-wide embeddings client (keeps its HTTP connection pool warm)."""
+    return OpenAIEmbeddings(model=model)
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of normalized query → embedding, entries expire after `ttl` seconds."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(query: str, model: str = EMBED_MODEL) -> str:
+        return f"{model}:{normalize_text(query)}"
+
+    def get(self, query: str, model: str = EMBED_MODEL) -> Optional[List[float]]:
+        key = self.key(query, model)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, query: str, embedding: List[float], model: str = EMBED_MODEL):
+        key = self.key(query, model)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    max_entries=settings.query_embedding_cache_size,
+    ttl=settings.query_embedding_cache_ttl,
+)
@@ -0,0 +1,136 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from db.session import SessionLocal
+from ingestion.ingest_initial_resumes import ResumeIngestionPipeline
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+class IngestionJob:
+    def __init__(self, files: List[str], job_id: Optional[str] = None,
+                 stored_paths: Optional[Dict[str, str]] = None):
+        self.id = job_id or new_job_id()
+        self.files = files
+        self.stored_paths = stored_paths  # see ResumeIngestionPipeline.run
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.pipeline: Optional[ResumeIngestionPipeline] = None
+        # final counters, kept after the pipeline is released
+        self.progress: Optional[Dict] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def to_dict(self) -> Dict:
+        if self.pipeline:
+            progress = dict(self.pipeline.progress)
+        elif self.progress:
+            progress = dict(self.progress)
+        else:
+            progress = {
+                "files_total": len(self.files), "files_skipped": 0, "files_done": 0,
+                "files_failed": 0, "chunks": 0, "embeddings": 0, "summaries": 0, "errors": [],
+            }
+
+        elapsed = None
+        if self.started_at:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        progress["elapsed_seconds"] = round(elapsed, 3) if elapsed else elapsed
+        progress["files_per_sec"] = round(progress["files_done"] / elapsed, 3) if elapsed else 0.0
+        progress["chunks_per_sec"] = round(progress["chunks"] / elapsed, 3) if elapsed else 0.0
+
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "files": len(self.files),
+            "progress": progress,
+        }
+
+
+class IngestionJobManager:
+    """
+    Runs ingestion pipelines on a small thread pool inside the API process.
+    Each job gets its own DB session; extraction processes are spawned
+    (not forked) since the API process is multi-threaded.
+
+    The job registry is in process memory: run the API with a single worker
+    (or route /ingest to one) so status requests reach the process running
+    the job. Finished jobs are kept for `ingest_job_ttl` seconds, at most
+    `ingest_job_max_finished` of them.
+    """
+
+    def __init__(self, workers: int = settings.ingest_job_workers):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-job")
+        self.jobs: Dict[str, IngestionJob] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, files: List[str], job_id: Optional[str] = None,
+               stored_paths: Optional[Dict[str, str]] = None) -> IngestionJob:
+        job = IngestionJob(files, job_id, stored_paths)
+        with self.lock:
+            self._prune()
+            self.jobs[job.id] = job
+        self.pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self.lock:
+            self._prune()
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[IngestionJob]:
+        with self.lock:
+            self._prune()
+            jobs = list(self.jobs.values())
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def _prune(self):
+        """Drop finished jobs past the TTL, then the oldest beyond the cap. Caller holds the lock."""
+        now = time.time()
+        finished = sorted((j for j in self.jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished:
+            if now - job.finished_at > settings.ingest_job_ttl:
+                del self.jobs[job.id]
+        finished = [j for j in finished if j.id in self.jobs]
+        for job in finished[:max(0, len(finished) - settings.ingest_job_max_finished)]:
+            del self.jobs[job.id]
+
+    def _run(self, job: IngestionJob):
+        db = SessionLocal()
+        try:
+            job.pipeline = ResumeIngestionPipeline(
+                db,
+                workers=settings.ingest_extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            job.status = "running"
+            job.started_at = time.time()
+            job.pipeline.run(job.files, job.stored_paths)
+            job.status = "completed_with_errors" if job.pipeline.progress["files_failed"] else "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            print(f"Ingestion job {job.id} failed: {e}")
+        finally:
+            # keep the counters, release the pipeline (session, batcher, caches)
+            if job.pipeline:
+                job.progress = dict(job.pipeline.progress)
+                job.pipeline = None
+            job.finished_at = time.time()
+            db.close()
+
+
+job_manager = IngestionJobManager()
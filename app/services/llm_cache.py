@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from app.core.config import settings
+
+# Check the row count only every N stored responses
+EVICT_CHECK_EVERY = 100
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        node TEXT NOT NULL,
+        response TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used_at ON llm_cache (last_used_at);
+"""
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _serialize(generations: RETURN_VAL_TYPE) -> str:
+    return json.dumps([
+        {"message": message_to_dict(g.message)} if isinstance(g, ChatGeneration) else {"text": g.text}
+        for g in generations
+    ])
+
+
+def _deserialize(payload: str) -> RETURN_VAL_TYPE:
+    generations = []
+    for item in json.loads(payload):
+        if "message" in item:
+            generations.append(ChatGeneration(message=messages_from_dict([item["message"]])[0]))
+        else:
+            generations.append(Generation(text=item["text"]))
+    return generations
+
+
+def _count(node: str, key: str):
+    with _lock:
+        node_stats = _stats.setdefault(node, {"hits": 0, "misses": 0, "stored": 0})
+        node_stats[key] += 1
+
+
+def llm_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Per-node counters plus the current size of the shared store."""
+    with _lock:
+        stats = {node: dict(s) for node, s in _stats.items()}
+    for s in stats.values():
+        lookups = s["hits"] + s["misses"]
+        s["hit_rate"] = s["hits"] / lookups if lookups else 0.0
+    if _store is not None:
+        stats["_store"] = {"entries": _store.count(), "evicted": _store.evicted}
+    return stats
+
+
+class ResponseStore:
+    """
+    SQLite file shared by every node's cache (and, via WAL, by every worker
+    process on the host). Entries expire after `ttl` seconds; beyond
+    `max_entries` the least recently used are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evicted = 0
+        self._stored_since_check = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA_SQL)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] + self.ttl < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def put(self, key: str, node: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, node, response, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, node, response, now, now),
+            )
+            self._stored_since_check += 1
+            if self._stored_since_check >= EVICT_CHECK_EVERY:
+                self._stored_since_check = 0
+                self._evict(now)
+
+    def _evict(self, now: float):
+        expired = self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+        excess = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used_at ASC LIMIT ?)",
+                (excess,),
+            )
+        self.evicted += expired + max(excess, 0)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Exact-match LangChain cache for one agent node. The key hashes the
+    serialized LLM parameters (model, temperature, stop, ...) together with
+    the prompt; the node name only labels metrics, so identical calls from
+    different nodes share entries.
+    """
+
+    def __init__(self, store: ResponseStore, node: str):
+        self.store = store
+        self.node = node
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        payload = self.store.get(self.key(prompt, llm_string))
+        if payload is None:
+            _count(self.node, "misses")
+            return None
+        _count(self.node, "hits")
+        return _deserialize(payload)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.store.put(self.key(prompt, llm_string), self.node, _serialize(return_val))
+        _count(self.node, "stored")
+
+    def clear(self, **kwargs) -> None:
+        self.store.clear()
+
+
+_store: Optional[ResponseStore] = None
+_store_lock = threading.Lock()
+
+
+def llm_cache(node: str) -> Optional[LLMResponseCache]:
+    """Cache for ChatOpenAI(cache=...) of `node`, or None when disabled."""
+    global _store
+    if not settings.llm_cache_enabled:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResponseStore(
+                settings.llm_cache_path, settings.llm_cache_ttl, settings.llm_cache_max_entries
+            )
+    return LLMResponseCache(_store, node)
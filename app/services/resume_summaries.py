@@ -0,0 +1,201 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain_openai import ChatOpenAI
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from db.models.resume_summary import ResumeSummary
+from db.session import SessionLocal
+
+SUMMARY_MODEL = "gpt-4o-mini"
+# Stored summaries are keyed on this; bump it whenever SUMMARY_PROMPT changes
+SUMMARY_PROMPT_VERSION = "v1"
+
+SUMMARY_PROMPT = """
+Summarize the following resume focusing on:
+- Key skills
+- Experience level
+- Best-fit roles
+
+Resume:
+{text}
+"""
+
+# Resumes with the summary of their current content (NULL when not generated yet)
+SUMMARY_LOOKUP_SQL = text("""
+    SELECT r.id AS resume_id,
+           COALESCE(r.content_hash, '') AS content_hash,
+           rs.summary,
+           CASE WHEN :include_text AND rs.summary IS NULL THEN r.text_md END AS text_md
+    FROM resumes r
+    LEFT JOIN resume_summaries rs
+           ON rs.resume_id = r.id
+          AND rs.content_hash = COALESCE(r.content_hash, '')
+          AND rs.prompt_version = :prompt_version
+    WHERE r.id = ANY(:resume_ids)
+""")
+
+
+class ResumeSummaryStore:
+    """
+    resume_summaries keyed by (resume id, content hash, prompt version): a
+    changed resume or prompt simply misses. Like EmbeddingCache, it never
+    commits; the caller owns the transaction.
+    """
+
+    def __init__(self, db: Session, prompt_version: str, model: str):
+        self.db = db
+        self.prompt_version = prompt_version
+        self.model = model
+
+    def lookup(self, resume_ids: List[int], include_text: bool = False) -> Dict[int, Dict]:
+        """resume id → {content_hash, summary, text_md}; text only for misses."""
+        if not resume_ids:
+            return {}
+        rows = self.db.execute(SUMMARY_LOOKUP_SQL, {
+            "resume_ids": list(resume_ids),
+            "prompt_version": self.prompt_version,
+            "include_text": include_text,
+        }).mappings()
+        return {row["resume_id"]: dict(row) for row in rows}
+
+    def put_many(self, rows: List[Tuple[int, str, str]]):
+        """Store (resume_id, content_hash, summary) rows; first writer wins."""
+        if not rows:
+            return
+        stmt = insert(ResumeSummary).values([
+            {
+                "resume_id": resume_id,
+                "content_hash": content_hash,
+                "prompt_version": self.prompt_version,
+                "model": self.model,
+                "summary": summary,
+            }
+            for resume_id, content_hash, summary in rows
+        ]).on_conflict_do_nothing()
+        self.db.execute(stmt)
+
+
+@lru_cache(maxsize=None)
+def summary_llm() -> ChatOpenAI:
+    # timeout bounds each attempt and every retry starts a new one, so retries stay
+    # few: an item's worst case is (max_retries + 1) * timeout plus backoff
+    return ChatOpenAI(
+        model=SUMMARY_MODEL, temperature=0, timeout=settings.summary_timeout,
+        max_retries=settings.summary_max_retries, cache=llm_cache("resume_summary"),
+    )
+
+
+def generate_summaries(resume_texts: List[str]) -> List[Optional[str]]:
+    """
+    Summaries for many resumes, at most `summary_concurrency` requests in
+    flight. A failed or timed-out item yields None instead of failing the batch.
+    """
+    if not resume_texts:
+        return []
+    responses = summary_llm().batch(
+        [SUMMARY_PROMPT.format(text=t) for t in resume_texts],
+        config={"max_concurrency": settings.summary_concurrency},
+        return_exceptions=True,
+    )
+    return summary_contents(responses)
+
+
+async def agenerate_summaries(resume_texts: List[str]) -> List[Optional[str]]:
+    """
+    Async generate_summaries, for the request path. Each item also gets a
+    hard `summary_timeout` deadline from the moment it starts, retries
+    included, so one slow summary cannot stretch the answer.
+    """
+    if not resume_texts:
+        return []
+    llm = summary_llm()
+    semaphore = asyncio.Semaphore(settings.summary_concurrency)
+
+    async def summarize(text: str):
+        async with semaphore:
+            return await asyncio.wait_for(
+                llm.ainvoke(SUMMARY_PROMPT.format(text=text)), timeout=settings.summary_timeout
+            )
+
+    responses = await asyncio.gather(*(summarize(t) for t in resume_texts), return_exceptions=True)
+    return summary_contents(responses)
+
+
+def summary_contents(responses: List) -> List[Optional[str]]:
+    summaries = []
+    for response in responses:
+        if isinstance(response, Exception):
+            print(f"Resume summary failed: {response!r}")
+            summaries.append(None)
+        else:
+            summaries.append(response.content)
+    return summaries
+
+
+class SummaryPrecomputer:
+    """
+    Generates summaries for freshly written resumes on a background pool, so
+    ingestion batches do not wait on the LLM. `generate` maps resume texts to
+    summaries (None for failures, which are simply retried on the next read).
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[List[str]], List[Optional[str]]],
+        prompt_version: str,
+        model: str,
+        workers: int = settings.summary_precompute_workers,
+    ):
+        self.generate = generate
+        self.prompt_version = prompt_version
+        self.model = model
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-summary")
+        self.lock = threading.Lock()
+        self.generated = 0
+        self.failed = 0
+
+    def submit(self, resume_ids: List[int]) -> Future:
+        return self.pool.submit(self._run, list(resume_ids))
+
+    def _run(self, resume_ids: List[int]) -> int:
+        db = SessionLocal()
+        try:
+            store = ResumeSummaryStore(db, self.prompt_version, self.model)
+            missing = [row for row in store.lookup(resume_ids, include_text=True).values()
+                       if row["summary"] is None]
+            if not missing:
+                return 0
+            summaries = self.generate([row["text_md"] for row in missing])
+            rows = [(row["resume_id"], row["content_hash"], summary)
+                    for row, summary in zip(missing, summaries) if summary is not None]
+            store.put_many(rows)
+            db.commit()
+            with self.lock:
+                self.generated += len(rows)
+                self.failed += len(missing) - len(rows)
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            print(f"Summary precompute failed for resumes {resume_ids}: {e}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def wait(futures: List[Future]) -> int:
+        """Block until `futures` finish; returns how many summaries they stored."""
+        done, _ = wait(futures)
+        return sum(f.result() for f in done if f.exception() is None)
+
+
+@lru_cache(maxsize=None)
+def get_summary_precomputer() -> SummaryPrecomputer:
+    return SummaryPrecomputer(generate_summaries, SUMMARY_PROMPT_VERSION, SUMMARY_MODEL)
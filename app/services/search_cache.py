@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.embedding_cache import normalize_text
+
+CORPUS_VERSION_SQL = text("SELECT version FROM corpus_version WHERE id = 1")
+
+BUMP_CORPUS_VERSION_SQL = text("""
+    UPDATE corpus_version SET version = version + 1, updated_at = now() WHERE id = 1
+""")
+
+
+def corpus_version(db: Session) -> int:
+    return db.execute(CORPUS_VERSION_SQL).scalar() or 0
+
+
+def bump_corpus_version(db: Session):
+    """
+    Bump in its own short transaction, after the data commit: inside the
+    ingestion transaction the row lock would serialize concurrent batches
+    until they commit. Bumping after (never before) the data is visible
+    means a result cached under the old version can only be stale until
+    this commit, and results computed on the new data are never keyed
+    under a version older than that data.
+    """
+    db.execute(BUMP_CORPUS_VERSION_SQL)
+    db.commit()
+
+
+class SearchResultCache:
+    """
+    Serialized search results keyed on (normalized query, search params,
+    corpus version). Since the version is part of the key, an ingestion
+    commit makes every older entry unreachable; those age out of the LRU.
+
+    In-process tier: LRU bounded by `max_bytes` of serialized results, with
+    a TTL. Optional shared tier: Redis (`redis_url`), used on local misses
+    and written through, so workers and hosts share hits.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, redis_url: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self._redis = None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_errors = 0
+
+    @staticmethod
+    def key(query: str, version: Any, **params) -> str:
+        raw = orjson.dumps(
+            {"q": normalize_text(query), "v": version, **params}, option=orjson.OPT_SORT_KEYS
+        )
+        return "search:" + hashlib.sha256(raw).hexdigest()
+
+    def _shared(self):
+        if self._redis is None and self.redis_url:
+            import redis  # optional dependency, only needed with REDIS_URL
+
+            self._redis = redis.Redis.from_url(self.redis_url, socket_timeout=0.2)
+        return self._redis
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return orjson.loads(entry[1])
+            if entry is not None:
+                self._drop(key)
+
+        payload = self._shared_get(key)
+        if payload is not None:
+            self.shared_hits += 1
+            self._store(key, payload)
+            return orjson.loads(payload)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        payload = orjson.dumps(value)
+        self._store(key, payload)
+        shared = self._shared()
+        if shared is not None:
+            try:
+                shared.set(key, payload, ex=max(1, int(self.ttl)))
+            except Exception as e:
+                self.shared_errors += 1
+                print(f"Search cache: Redis write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() for the event loop: the blocking Redis tier runs in a worker thread."""
+        if self.redis_url:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aput(self, key: str, value: Any):
+        if self.redis_url:
+            await asyncio.to_thread(self.put, key, value)
+        else:
+            self.put(key, value)
+
+    def _shared_get(self, key: str) -> Optional[bytes]:
+        shared = self._shared()
+        if shared is None:
+            return None
+        try:
+            return shared.get(key)
+        except Exception as e:
+            # a Redis outage degrades to the local tier only
+            self.shared_errors += 1
+            print(f"Search cache: Redis read failed: {e}")
+            return None
+
+    def _store(self, key: str, payload: bytes):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, payload)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: str):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "shared_errors": self.shared_errors,
+                "shared_tier": bool(self.redis_url),
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+search_result_cache = SearchResultCache(
+    max_bytes=settings.search_cache_max_bytes,
+    ttl=settings.search_cache_ttl,
+    redis_url=settings.redis_url,
+)
@@ -1,65 +1,698 @@
-from typing import List, Dict
+import asyncio
+import base64
+import json
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from langchain_openai import OpenAIEmbeddings
-
+from app.core.config import settings
 from app.core.constants import EMBED_MODEL
+from app.core.vector_compact import COMPACT_DISTANCE_OPS, ann_index_name, compact_expression, compact_mode
+from app.services.embedding_cache import EmbeddingCache, normalize_text, text_hash
+from app.services.embeddings import get_embedder, query_embedding_cache
+from app.services.search_cache import corpus_version, search_result_cache
+from app.services.vector_index import get_vector_index
+from db.session import release_connection
+
+SEARCH_MODES = ("vector", "keyword", "hybrid")
+
+# pgvector rejects larger hnsw.ef_search values
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def max_candidates() -> int:
+    """Widest candidate window: an HNSW scan returns at most ef_search rows."""
+    return min(settings.search_max_candidates, HNSW_MAX_EF_SEARCH)
+
+
+def scan_window(candidates: int) -> int:
+    """
+    Rows the index scan must return for a window of `candidates` chunks: the
+    window itself, or rescore_multiplier x it when a compact index is
+    rescored. Capped at HNSW_MAX_EF_SEARCH (the scan cannot return more), so
+    wide windows get a smaller rescore margin, never a truncated scan.
+    """
+    if compact_mode() == "none":
+        return candidates
+    return max(candidates, min(candidates * settings.vector_rescore_multiplier, HNSW_MAX_EF_SEARCH))
+
+
+INDEX_EXISTS_SQL = text("SELECT to_regclass(:name) IS NOT NULL")
+
+
+def check_ann_index(db: Session):
+    """
+    Fail fast when the index the configured compact mode queries against is
+    missing: without it every vector search is a sequential scan computing
+    the compact form of every row.
+    """
+    name = ann_index_name()
+    if not db.execute(INDEX_EXISTS_SQL, {"name": name}).scalar():
+        raise RuntimeError(
+            f"ANN index {name} for VECTOR_COMPACT_MODE={compact_mode()} is missing; "
+            f"build it with `python -m ingestion.build_ann_index`"
+        )
+
+
+ANN_PARAMS_SQL = text("""
+    SELECT set_config('hnsw.ef_search', :ef_search, true),
+           set_config('ivfflat.probes', :probes, true)
+""")
+
+
+def set_ann_params(db: Session, ef_search: Optional[int] = None, probes: Optional[int] = None):
+    """Set index recall knobs for the current transaction only."""
+    db.execute(ANN_PARAMS_SQL, {
+        "ef_search": str(ef_search or settings.vector_ef_search),
+        "probes": str(probes or settings.vector_probes),
+    })
+
+
+def nearest_chunks_sql(query_vector: str, columns: str, where: str = "TRUE") -> str:
+    """
+    The :candidates chunks nearest to `query_vector` by full-precision cosine
+    distance, as `columns` plus `distance`. With a compact index configured,
+    the index scan pulls a :shortlist on the compact form and only those rows
+    are rescored against the full vectors.
+    """
+    if compact_mode() == "none":
+        return f"""
+            SELECT {columns}, rc.embedding <=> {query_vector} AS distance
+            FROM resume_chunks rc
+            WHERE {where}
+            ORDER BY rc.embedding <=> {query_vector}
+            LIMIT :candidates
+        """
+    return f"""
+        SELECT {columns}, rc.embedding <=> {query_vector} AS distance
+        FROM (
+            SELECT rc.id
+            FROM resume_chunks rc
+            WHERE {where}
+            ORDER BY {compact_expression("rc.embedding")}
+                     {COMPACT_DISTANCE_OPS[compact_mode()]} {compact_expression(query_vector)}
+            LIMIT :shortlist
+        ) s
+        JOIN resume_chunks rc ON rc.id = s.id
+        ORDER BY rc.embedding <=> {query_vector}
+        LIMIT :candidates
+    """
+
+
+# Shared tail of both retrieval queries: `best` (resume_id, score, sort_key) and
+# `snippets` (resume_id, chunk_text, score, rn) → one row per ranked resume.
+RESUME_ROWS_SQL = """
+    SELECT
+        b.resume_id,
+        b.score,
+        b.sort_key,
+        r.file_path,
+        CASE WHEN :include_text THEN r.text_md END AS text_md,
+        e.id AS employee_id,
+        e.name AS employee_name,
+        e.role AS employee_role,
+        (
+            SELECT json_agg(json_build_object('text', s.chunk_text, 'score', s.score) ORDER BY s.rn)
+            FROM snippets s
+            WHERE s.resume_id = b.resume_id AND s.rn <= :snippets
+        ) AS snippets,
+        {exhausted} AS exhausted
+    FROM best b
+    JOIN resumes r ON r.id = b.resume_id
+    JOIN employees e ON e.email = r.employee_email
+    ORDER BY b.sort_key ASC, b.resume_id ASC
+"""
+
+# Keyset condition on (sort_key, resume_id) for cursor pagination
+AFTER_CURSOR_SQL = """
+    CAST(:after_key AS double precision) IS NULL
+    OR ({sort_key}, resume_id) > (CAST(:after_key AS double precision), CAST(:after_id AS integer))
+"""
+
+NEAREST_RESUMES_SQL = text("""
+    WITH nearest AS (""" + nearest_chunks_sql("CAST(:embedding AS vector)", "rc.id AS chunk_id, rc.resume_id") + """),
+    best AS (
+        SELECT resume_id, MIN(distance) AS score, MIN(distance) AS sort_key
+        FROM nearest
+        GROUP BY resume_id
+        HAVING """ + AFTER_CURSOR_SQL.format(sort_key="MIN(distance)") + """
+        ORDER BY sort_key ASC, resume_id ASC
+        LIMIT :top_k
+    ),
+    snippets AS (
+        SELECT n.resume_id, n.distance AS score, rc.chunk_text,
+               ROW_NUMBER() OVER (PARTITION BY n.resume_id ORDER BY n.distance) AS rn
+        FROM nearest n
+        JOIN best b ON b.resume_id = n.resume_id
+        JOIN resume_chunks rc ON rc.id = n.chunk_id
+    )
+""" + RESUME_ROWS_SQL.format(exhausted="(SELECT COUNT(*) FROM nearest) < :candidates"))
+
+# Vector and full-text legs fused with reciprocal rank fusion at chunk level,
+# then the best fused chunk per resume. The vector leg is switched off (a
+# one-time filter, no scan) for keyword-only queries.
+HYBRID_RESUMES_SQL = text("""
+    WITH vec AS (
+        SELECT chunk_id, resume_id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+        FROM (""" + nearest_chunks_sql(
+            "CAST(:embedding AS vector)", "rc.id AS chunk_id, rc.resume_id",
+            where="CAST(:use_vector AS boolean)",
+        ) + """) v
+    ),
+    kw AS (
+        SELECT chunk_id, resume_id, ROW_NUMBER() OVER (ORDER BY lexical_rank DESC, chunk_id) AS rank
+        FROM (
+            SELECT rc.id AS chunk_id,
+                   rc.resume_id,
+                   ts_rank_cd(rc.chunk_tsv, q) AS lexical_rank
+            FROM resume_chunks rc, websearch_to_tsquery('english', :query) q
+            WHERE rc.chunk_tsv @@ q
+            ORDER BY lexical_rank DESC
+            LIMIT :candidates
+        ) k
+    ),
+    fused AS (
+        SELECT COALESCE(v.chunk_id, k.chunk_id) AS chunk_id,
+               COALESCE(v.resume_id, k.resume_id) AS resume_id,
+               COALESCE(:vector_weight / (:rrf_k + v.rank), 0)
+                 + COALESCE(:keyword_weight / (:rrf_k + k.rank), 0) AS rrf
+        FROM vec v
+        FULL OUTER JOIN kw k ON k.chunk_id = v.chunk_id
+    ),
+    best AS (
+        SELECT resume_id, MAX(rrf) AS score, -MAX(rrf) AS sort_key
+        FROM fused
+        GROUP BY resume_id
+        HAVING """ + AFTER_CURSOR_SQL.format(sort_key="-MAX(rrf)") + """
+        ORDER BY sort_key ASC, resume_id ASC
+        LIMIT :top_k
+    ),
+    snippets AS (
+        SELECT f.resume_id, f.rrf AS score, rc.chunk_text,
+               ROW_NUMBER() OVER (PARTITION BY f.resume_id ORDER BY f.rrf DESC) AS rn
+        FROM fused f
+        JOIN best b ON b.resume_id = f.resume_id
+        JOIN resume_chunks rc ON rc.id = f.chunk_id
+    )
+""" + RESUME_ROWS_SQL.format(
+    exhausted="(SELECT COUNT(*) FROM vec) < :candidates AND (SELECT COUNT(*) FROM kw) < :candidates"
+))
+
+
+# Many queries in one statement: each query vector drives its own index-ordered
+# nearest-chunk scan through a LATERAL join, collapsed to its top_k resumes.
+BATCH_NEAREST_RESUMES_SQL = text("""
+    WITH q AS (
+        SELECT ord, CAST(qv AS vector) AS embedding
+        FROM unnest(CAST(:embeddings AS text[])) WITH ORDINALITY AS t(qv, ord)
+    )
+    SELECT
+        q.ord,
+        b.resume_id,
+        b.score,
+        r.file_path,
+        CASE WHEN :include_text THEN r.text_md END AS text_md,
+        e.id AS employee_id,
+        e.name AS employee_name,
+        e.role AS employee_role,
+        b.snippets,
+        b.window_rows
+    FROM q
+    CROSS JOIN LATERAL (
+        SELECT n.resume_id,
+               MIN(n.distance) AS score,
+               -- chunks in this query's window; == :candidates means it was saturated
+               SUM(COUNT(*)) OVER () AS window_rows,
+               array_to_json((array_agg(
+                   json_build_object('text', n.chunk_text, 'score', n.distance) ORDER BY n.distance
+               ))[1:CAST(:snippets AS integer)]) AS snippets
+        FROM (""" + nearest_chunks_sql("q.embedding", "rc.resume_id, rc.chunk_text") + """) n
+        GROUP BY n.resume_id
+        ORDER BY score ASC, n.resume_id ASC
+        LIMIT :top_k
+    ) b
+    JOIN resumes r ON r.id = b.resume_id
+    JOIN employees e ON e.email = r.employee_email
+    ORDER BY q.ord, b.score ASC, b.resume_id ASC
+""")
+
+# search_backend="numpy": the index ranks chunk ids in-process, Postgres only
+# fills in resume/employee rows and snippet text by primary key
+RESUME_METADATA_SQL = text("""
+    SELECT
+        r.id AS resume_id,
+        r.file_path,
+        CASE WHEN :include_text THEN r.text_md END AS text_md,
+        e.id AS employee_id,
+        e.name AS employee_name,
+        e.role AS employee_role
+    FROM resumes r
+    JOIN employees e ON e.email = r.employee_email
+    WHERE r.id = ANY(:resume_ids)
+""")
+
+CHUNK_TEXTS_SQL = text("""
+    SELECT id, chunk_text FROM resume_chunks WHERE id = ANY(:chunk_ids)
+""")
+
+
+def vector_literal(embedding: List[float]) -> str:
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+
+def encode_cursor(sort_key: float, resume_id: int) -> str:
+    """Opaque keyset cursor: position after this match in the ranked list."""
+    raw = json.dumps({"k": sort_key, "r": resume_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(data["k"]), int(data["r"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
 
 
 class SemanticSearchService:
     def __init__(self, db: Session):
         self.db = db
-        self.embedder = OpenAIEmbeddings(model=EMBED_MODEL)
+        self.embedder = get_embedder(EMBED_MODEL)
+        self.embedding_cache = EmbeddingCache(db, EMBED_MODEL, touch=False)
 
     def search(
         self,
         query: str,
         top_k: int = 5,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        include_text: bool = False,
+        snippets: int = 3,
+        cursor: Optional[str] = None,
+        mode: str = "vector",
+    ) -> List[Dict]:
+        """
+        Ranked resumes for `query`, each with its best-matching chunk snippets.
+        The full resume markdown is only fetched when `include_text` is set;
+        `cursor` (any match's "cursor") continues after that match.
+
+        `mode` is "vector" (cosine distance, lower score is better), "keyword"
+        (full-text only, no embedding call) or "hybrid" (both legs fused with
+        reciprocal rank fusion); for the last two a higher score is better.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        after = decode_cursor(cursor) if cursor else (None, None)
+
+        cache_key = self.result_cache_key(
+            query, top_k=top_k, mode=mode, ef_search=ef_search, probes=probes,
+            include_text=include_text, snippets=snippets, cursor=cursor,
+        )
+        if cache_key is not None:
+            cached = search_result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        matches = self.run_search(query, top_k, ef_search, probes, include_text, snippets, after, mode)
+        if cache_key is not None:
+            search_result_cache.put(cache_key, matches)
+        return matches
+
+    def result_cache_key(self, query: str, mode: str = "vector", **params) -> Optional[str]:
+        if not settings.search_cache_enabled:
+            return None
+        return search_result_cache.key(query, self.corpus_version(mode), mode=mode, **params)
+
+    def run_search(
+        self,
+        query: str,
+        top_k: int,
+        ef_search: Optional[int],
+        probes: Optional[int],
+        include_text: bool,
+        snippets: int,
+        after: Tuple[Optional[float], Optional[int]],
+        mode: str,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict]:
-        # 1️⃣ Generate query embedding
-        query_embedding = self.embedder.embed_query(query)
-
-        # 2️⃣ pgvector similarity search
-        # Using cosine distance (<=>)
-        sql = text("""
-            SELECT
-                r.id AS resume_id,
-                r.file_path,
-                r.text_md,
-                e.id AS employee_id,
-                e.name AS employee_name,
-                e.role AS employee_role,
-                MIN(rc.embedding <=> (:embedding)::vector) AS score
-            FROM resume_chunks rc
-            JOIN resumes r ON r.id = rc.resume_id
-            JOIN employees e ON e.id = r.employee_id
-            GROUP BY r.id, e.id
-            ORDER BY score ASC
-            LIMIT :top_k;
-        """)
-
-        rows = self.db.execute(
-            sql,
-            {
-                "embedding": query_embedding,
-                "top_k": top_k,
-            },
-        ).mappings().all()
+
+        # 1️⃣ Generate query embedding (not needed for pure keyword search)
+        if query_embedding is None and mode != "keyword":
+            query_embedding = self.embed_query(query)
+
+        # 2️⃣ Two-stage retrieval: nearest chunks first, then best chunk per resume
+        params = {
+            "embedding": query_embedding,
+            "include_text": include_text,
+            "snippets": snippets,
+            "after_key": after[0],
+            "after_id": after[1],
+        }
+        if mode == "vector" and settings.search_backend == "numpy":
+            rows = self.index_resumes(query_embedding, top_k, include_text, snippets, after)
+            return [self.format_match(row, include_text) for row in rows]
+        if mode == "vector":
+            sql = NEAREST_RESUMES_SQL
+        else:
+            sql = HYBRID_RESUMES_SQL
+            params.update({
+                "query": query,
+                "use_vector": mode == "hybrid",
+                "rrf_k": settings.hybrid_rrf_k,
+                "vector_weight": settings.hybrid_vector_weight,
+                "keyword_weight": settings.hybrid_keyword_weight,
+            })
+        rows = self.ranked_resumes(sql, params, top_k, ef_search=ef_search, probes=probes)
 
         # 3️⃣ Format response
-        results = []
+        return [self.format_match(row, include_text) for row in rows]
+
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        include_text: bool = False,
+        snippets: int = 3,
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Vector search for many queries: one embeddings call for all cache
+        misses and one SQL round-trip for all queries. Results are keyed by
+        query; a query whose candidate window was saturated but collapsed to
+        fewer than top_k resumes is widened individually (a short result from
+        an unsaturated window means the corpus is exhausted). Precomputed
+        `embeddings` must be aligned with the de-duplicated queries.
+        """
+        queries = list(dict.fromkeys(queries))
+        if embeddings is None:
+            embeddings = self.embed_queries(queries)
+
+        if settings.search_backend == "numpy":
+            return {
+                query: [self.format_match(row, include_text)
+                        for row in self.index_resumes(embedding, top_k, include_text, snippets)]
+                for query, embedding in zip(queries, embeddings)
+            }
+
+        candidates = min(top_k * settings.search_candidate_multiplier, max_candidates())
+        shortlist = self.set_window(candidates, ef_search, probes)
+        rows = self.db.execute(BATCH_NEAREST_RESUMES_SQL, {
+            "embeddings": [vector_literal(e) for e in embeddings],
+            "candidates": candidates,
+            "shortlist": shortlist,
+            "top_k": top_k,
+            "include_text": include_text,
+            "snippets": snippets,
+        }).mappings().all()
+
+        results: Dict[str, List[Dict]] = {q: [] for q in queries}
+        saturated = set()
         for row in rows:
-            results.append({
-                "resume_id": row["resume_id"],
-                "score": float(row["score"]),
-                "employee": {
-                    "id": row["employee_id"],
-                    "name": row["employee_name"],
-                    "role": row["employee_role"],
-                },
-                "file_path": row["file_path"],
-                "resume_text": row["text_md"],
+            query = queries[row["ord"] - 1]
+            results[query].append(self.format_match({**row, "sort_key": row["score"]}, include_text))
+            if row["window_rows"] >= candidates:
+                saturated.add(query)
+
+        if candidates < max_candidates():
+            for query, embedding in zip(queries, embeddings):
+                if len(results[query]) < top_k and query in saturated:
+                    rows = self.ranked_resumes(NEAREST_RESUMES_SQL, {
+                        "embedding": embedding,
+                        "include_text": include_text,
+                        "snippets": snippets,
+                        "after_key": None,
+                        "after_id": None,
+                    }, top_k, ef_search=ef_search, probes=probes)
+                    results[query] = [self.format_match(row, include_text) for row in rows]
+
+        return results
+
+    @staticmethod
+    def format_match(row, include_text: bool) -> Dict:
+        match = {
+            "resume_id": row["resume_id"],
+            "score": float(row["score"]),
+            "employee": {
+                "id": row["employee_id"],
+                "name": row["employee_name"],
+                "role": row["employee_role"],
+            },
+            "file_path": row["file_path"],
+            "snippets": row["snippets"] or [],
+            "cursor": encode_cursor(float(row["sort_key"]), row["resume_id"]),
+        }
+        if include_text:
+            match["resume_text"] = row["text_md"]
+        return match
+
+    def corpus_version(self, mode: str = "vector"):
+        """
+        Cache-key version of the data a search reads. The numpy index is
+        synced just after the ingestion commit, so its own version counts too.
+        """
+        version = corpus_version(self.db)
+        if mode == "vector" and settings.search_backend == "numpy":
+            return [version, list(get_vector_index().version())]
+        return version
+
+    def embed_query(self, query: str) -> List[float]:
+        """In-process LRU → embedding_cache table → embeddings API."""
+        embedding = query_embedding_cache.get(query, EMBED_MODEL)
+        if embedding is None:
+            embedding = self.embedding_cache.embed_query(self.embedder, query)
+            self.db.commit()
+            query_embedding_cache.put(query, embedding, EMBED_MODEL)
+        return embedding
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Like embed_query for many queries, with a single API call for all misses."""
+        embeddings = {q: query_embedding_cache.get(q, EMBED_MODEL) for q in queries}
+        missing = [q for q, e in embeddings.items() if e is None]
+        if missing:
+            vectors = self.embedding_cache.embed_documents(self.embedder, missing)
+            self.db.commit()
+            for q, vec in zip(missing, vectors):
+                query_embedding_cache.put(q, vec, EMBED_MODEL)
+                embeddings[q] = vec
+        return [embeddings[q] for q in queries]
+
+    def ranked_resumes(
+        self,
+        sql,
+        params: Dict,
+        top_k: int,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ):
+        """
+        Pull the `candidates` nearest chunks with a plain ORDER BY ... LIMIT
+        (index-friendly), collapse them to distinct resumes, and only then join
+        resume/employee rows for the final top_k. When the candidate window
+        yields fewer than top_k resumes (many chunks from the same resume), it is
+        widened until either enough resumes come back or the corpus is exhausted.
+        """
+        candidates = top_k * settings.search_candidate_multiplier
+        while True:
+            candidates = min(candidates, max_candidates())
+            shortlist = self.set_window(candidates, ef_search, probes)
+            rows = self.db.execute(
+                sql, {**params, "candidates": candidates, "shortlist": shortlist, "top_k": top_k}
+            ).mappings().all()
+
+            # With no rows we only know the corpus is exhausted on the first page;
+            # past a cursor the window may simply not reach the next resumes yet
+            exhausted = rows[0]["exhausted"] if rows else params["after_key"] is None
+            if len(rows) >= top_k or exhausted or candidates >= max_candidates():
+                return rows
+            candidates *= 4
+
+    def set_window(self, candidates: int, ef_search: Optional[int], probes: Optional[int]) -> int:
+        """
+        Set the ANN knobs for a window of `candidates` chunks and return the
+        index scan size (scan_window). ef_search is raised to cover the scan,
+        since HNSW returns at most ef_search rows.
+        """
+        shortlist = scan_window(candidates)
+        set_ann_params(
+            self.db,
+            ef_search=min(max(ef_search or settings.vector_ef_search, shortlist), HNSW_MAX_EF_SEARCH),
+            probes=probes,
+        )
+        return shortlist
+
+    def index_resumes(
+        self,
+        embedding: List[float],
+        top_k: int,
+        include_text: bool,
+        snippets: int,
+        after: Tuple[Optional[float], Optional[int]] = (None, None),
+    ) -> List[Dict]:
+        """
+        Exact search over the memory-mapped index, returning rows shaped like
+        the SQL paths (score and sort_key are the cosine distance).
+        """
+        hits = get_vector_index().search(embedding, top_k, snippets=snippets, after=after)
+        return self.index_rows(hits, include_text)
+
+    def index_rows(self, hits: List[Dict], include_text: bool) -> List[Dict]:
+        """Resume metadata and snippet texts for MemmapVectorIndex.search hits."""
+        if not hits:
+            return []
+
+        metadata = {
+            row["resume_id"]: row
+            for row in self.db.execute(RESUME_METADATA_SQL, {
+                "resume_ids": [h["resume_id"] for h in hits],
+                "include_text": include_text,
+            }).mappings()
+        }
+        chunk_texts = dict(self.db.execute(CHUNK_TEXTS_SQL, {
+            "chunk_ids": [chunk_id for h in hits for chunk_id, _ in h["chunks"]],
+        }).all())
+
+        rows = []
+        for hit in hits:
+            # an index row can outlive its resume until the next export
+            if hit["resume_id"] not in metadata:
+                continue
+            rows.append({
+                **metadata[hit["resume_id"]],
+                "score": hit["score"],
+                "sort_key": hit["score"],
+                "snippets": [
+                    {"text": chunk_texts[chunk_id], "score": distance}
+                    for chunk_id, distance in hit["chunks"] if chunk_id in chunk_texts
+                ],
             })
+        return rows
+
+
+class AsyncSemanticSearchService:
+    """
+    Async front for SemanticSearchService. Embedding misses go through the
+    async OpenAI client; SQL runs on the AsyncSession via run_sync, which
+    drives the sync service over the async driver without a worker thread.
+    Blocking work that is not SQL (Redis cache tier, the numpy index scan
+    and its file locks) runs in worker threads to keep the event loop free,
+    and the session's connection is released before every such wait.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.embedder = get_embedder(EMBED_MODEL)
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        include_text: bool = False,
+        snippets: int = 3,
+        cursor: Optional[str] = None,
+        mode: str = "vector",
+    ) -> List[Dict]:
+        """Same contract as SemanticSearchService.search."""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        after = decode_cursor(cursor) if cursor else (None, None)
 
+        cache_key = await self.db.run_sync(
+            lambda session: SemanticSearchService(session).result_cache_key(
+                query, top_k=top_k, mode=mode, ef_search=ef_search, probes=probes,
+                include_text=include_text, snippets=snippets, cursor=cursor,
+            )
+        )
+        # the connection goes back to the pool before any Redis or embeddings wait
+        await release_connection(self.db)
+        if cache_key is not None:
+            matches = await search_result_cache.aget(cache_key)
+            if matches is not None:
+                return matches
+
+        embedding = await self.embed_query(query) if mode != "keyword" else None
+        if mode == "vector" and settings.search_backend == "numpy":
+            hits = await asyncio.to_thread(
+                get_vector_index().search, embedding, top_k, snippets=snippets, after=after
+            )
+            matches = (await self.index_matches([hits], include_text))[0]
+        else:
+            matches = await self.db.run_sync(
+                lambda session: SemanticSearchService(session).run_search(
+                    query, top_k, ef_search, probes, include_text, snippets, after, mode,
+                    query_embedding=embedding,
+                )
+            )
+        # callers go on to LLM calls: don't hold the connection through them
+        await release_connection(self.db)
+        if cache_key is not None:
+            await search_result_cache.aput(cache_key, matches)
+        return matches
+
+    async def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        include_text: bool = False,
+        snippets: int = 3,
+    ) -> Dict[str, List[Dict]]:
+        """Same contract as SemanticSearchService.search_batch."""
+        queries = list(dict.fromkeys(queries))
+        embeddings = await self.embed_queries(queries)
+        if settings.search_backend == "numpy":
+            index = get_vector_index()
+            hits = await asyncio.to_thread(
+                lambda: [index.search(e, top_k, snippets=snippets) for e in embeddings]
+            )
+            results = dict(zip(queries, await self.index_matches(hits, include_text)))
+        else:
+            results = await self.db.run_sync(
+                lambda session: SemanticSearchService(session).search_batch(
+                    queries, top_k=top_k, ef_search=ef_search, probes=probes,
+                    include_text=include_text, snippets=snippets, embeddings=embeddings,
+                )
+            )
+        await release_connection(self.db)
         return results
+
+    async def index_matches(self, hits: List[List[Dict]], include_text: bool) -> List[List[Dict]]:
+        """Formatted matches for per-query MemmapVectorIndex.search hits."""
+        def format_all(session: Session):
+            service = SemanticSearchService(session)
+            return [
+                [service.format_match(row, include_text) for row in service.index_rows(h, include_text)]
+                for h in hits
+            ]
+
+        return await self.db.run_sync(format_all)
+
+    async def embed_query(self, query: str) -> List[float]:
+        return (await self.embed_queries([query]))[0]
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """In-process LRU → embedding_cache table → async embeddings API."""
+        embeddings = {q: query_embedding_cache.get(q, EMBED_MODEL) for q in queries}
+        missing = [q for q, e in embeddings.items() if e is None]
+        if missing:
+            stored = await self.db.run_sync(
+                lambda session: EmbeddingCache(session, EMBED_MODEL, touch=False).get_many(missing)
+            )
+            to_embed = list({normalize_text(q): q for q in missing if text_hash(q) not in stored}.values())
+            if to_embed:
+                await release_connection(self.db)
+                fresh = dict(zip(to_embed, await self.embedder.aembed_documents(to_embed)))
+                await self.db.run_sync(
+                    lambda session: EmbeddingCache(session, EMBED_MODEL).put_many(fresh)
+                )
+                stored.update({text_hash(q): vec for q, vec in fresh.items()})
+                await self.db.commit()
+            for q in missing:
+                embeddings[q] = stored[text_hash(q)]
+                query_embedding_cache.put(q, embeddings[q], EMBED_MODEL)
+        return [embeddings[q] for q in queries]
@@ -0,0 +1,446 @@
+import json
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_openai import ChatOpenAI
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.agents.context import truncate_tokens
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from db.models.employee_skill import EmployeeSkill
+
+# canonical skill → (category, aliases); only aliases are matched, case-insensitive
+# on whole words, so ambiguous short names ("go", "r", "lambda", "qa") are listed
+# only in unambiguous spellings. Where aliases overlap the longest wins, so
+# "react native" is not also react. SKILLS_TAXONOMY_PATH (same shape, JSON) extends it.
+SKILL_TAXONOMY: Dict[str, Tuple[str, List[str]]] = {
+    "python": ("language", ["python", "python3"]),
+    "java": ("language", ["java"]),
+    "javascript": ("language", ["javascript", "ecmascript", "es6"]),
+    "typescript": ("language", ["typescript"]),
+    "c++": ("language", ["c++", "cpp"]),
+    "c#": ("language", ["c#", "csharp"]),
+    "go": ("language", ["golang", "go lang"]),
+    "rust": ("language", ["rust", "rustlang"]),
+    "kotlin": ("language", ["kotlin"]),
+    "swift": ("language", ["swift", "swiftui"]),
+    "scala": ("language", ["scala"]),
+    "ruby": ("language", ["ruby"]),
+    "php": ("language", ["php"]),
+    "r": ("language", ["r programming", "rstudio", "r language"]),
+    "sql": ("language", ["sql", "t-sql", "pl/sql", "plsql"]),
+    "bash": ("language", ["bash", "shell scripting"]),
+    "react": ("frontend", ["react", "react.js", "reactjs"]),
+    "angular": ("frontend", ["angular", "angularjs"]),
+    "vue": ("frontend", ["vue", "vue.js", "vuejs"]),
+    "html/css": ("frontend", ["html", "html5", "css", "css3", "sass", "tailwind"]),
+    "node.js": ("backend", ["node.js", "nodejs", "node js", "express.js"]),
+    "django": ("backend", ["django"]),
+    "flask": ("backend", ["flask"]),
+    "fastapi": ("backend", ["fastapi"]),
+    "spring": ("backend", ["spring boot", "springboot", "spring framework", "spring mvc"]),
+    ".net": ("backend", [".net", "dotnet", "asp.net"]),
+    "graphql": ("backend", ["graphql"]),
+    "rest apis": ("backend", ["rest api", "rest apis", "restful", "rest services"]),
+    "microservices": ("backend", ["microservices", "microservice"]),
+    "postgresql": ("data", ["postgresql", "postgres"]),
+    "mysql": ("data", ["mysql", "mariadb"]),
+    "mongodb": ("data", ["mongodb", "mongo"]),
+    "redis": ("data", ["redis"]),
+    "elasticsearch": ("data", ["elasticsearch", "opensearch", "elastic search"]),
+    "kafka": ("data", ["kafka", "apache kafka"]),
+    "spark": ("data", ["spark", "pyspark", "apache spark"]),
+    "airflow": ("data", ["airflow", "apache airflow"]),
+    "dbt": ("data", ["dbt"]),
+    "snowflake": ("data", ["snowflake"]),
+    "data engineering": ("data", ["data engineering", "etl", "data pipelines", "data warehouse"]),
+    "pandas": ("data", ["pandas", "numpy"]),
+    "machine learning": ("ml", ["machine learning", "ml engineer", "scikit-learn", "sklearn"]),
+    "deep learning": ("ml", ["deep learning", "neural networks"]),
+    "pytorch": ("ml", ["pytorch", "torch"]),
+    "tensorflow": ("ml", ["tensorflow", "keras"]),
+    "nlp": ("ml", ["nlp", "natural language processing"]),
+    "computer vision": ("ml", ["computer vision", "opencv"]),
+    "llms": ("ml", ["llm", "llms", "large language models", "langchain", "retrieval augmented generation",
+                    "retrieval-augmented generation", "prompt engineering"]),
+    "mlops": ("ml", ["mlops", "mlflow", "kubeflow"]),
+    "data analysis": ("ml", ["data analysis", "data analytics", "statistics", "a/b testing"]),
+    "aws": ("cloud", ["aws", "amazon web services", "ec2", "amazon s3", "aws lambda"]),
+    "azure": ("cloud", ["azure", "microsoft azure"]),
+    "gcp": ("cloud", ["gcp", "google cloud", "bigquery"]),
+    "docker": ("devops", ["docker", "dockerfile", "containerization"]),
+    "kubernetes": ("devops", ["kubernetes", "k8s", "helm"]),
+    "terraform": ("devops", ["terraform", "infrastructure as code", "cloudformation"]),
+    "ci/cd": ("devops", ["ci/cd", "jenkins", "github actions", "gitlab ci", "continuous integration"]),
+    "linux": ("devops", ["linux", "unix"]),
+    "git": ("devops", ["git", "github", "gitlab"]),
+    "observability": ("devops", ["prometheus", "grafana", "datadog", "observability"]),
+    "security": ("security", ["cybersecurity", "security engineering", "penetration testing", "owasp"]),
+    "ios": ("mobile", ["ios"]),
+    "android": ("mobile", ["android"]),
+    "react native": ("mobile", ["react native"]),
+    "flutter": ("mobile", ["flutter", "dart"]),
+    "testing": ("quality", ["unit testing", "pytest", "junit", "selenium", "test automation",
+                            "qa automation", "quality assurance"]),
+    "agile": ("process", ["agile", "scrum", "kanban"]),
+    "project management": ("management", ["project management", "pmp", "program management"]),
+    "product management": ("management", ["product management", "product manager", "product owner"]),
+    "people management": ("management", ["people management", "team lead", "mentoring", "line management"]),
+    "ui/ux design": ("design", ["ux", "ui/ux", "user experience", "figma"]),
+    "communication": ("soft", ["communication skills", "stakeholder management", "presentation skills"]),
+}
+
+# Highest level first: the first pattern found on a role line wins; resumes
+# without titles fall back to years of experience
+SENIORITY_PATTERNS = [
+    ("principal", re.compile(
+        r"\b(principal (?:engineer|scientist|consultant|architect|developer)|director|vp|"
+        r"vice president|chief \w+ officer|cto|head of)\b"
+    )),
+    ("lead", re.compile(r"\b(lead|staff engineer|architect|engineering manager|team leader)\b")),
+    ("senior", re.compile(r"\b(senior|sr\.)")),
+    ("junior", re.compile(r"\b(junior|jr\.|graduate|entry[- ]level)")),
+    ("intern", re.compile(r"\b(intern|internship|trainee)\b")),
+]
+YEARS_STATED_RE = re.compile(r"\b(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b")
+YEAR_RANGE_RE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)\b"
+)
+MAX_CAREER_YEARS = 50
+
+# Role lines: headings and title lines, not bullets or prose; a title preceded by
+# one of PROSE_BEFORE_TITLE_RE on its line is someone else's ("reported to the director")
+ROLE_LINE_MAX_WORDS = 12
+BULLET_RE = re.compile(r"^\s*(?:[-*•+]|\d+[.)])\s+")
+PROSE_BEFORE_TITLE_RE = re.compile(
+    r"\b(to|with|for|under|by|from|alongside|the|a|an|our|my|their|his|her)\b"
+)
+# Date ranges of degrees are not career years: skip the Education section and
+# any line naming a degree or institution
+SECTION_TITLE_RE = re.compile(
+    r"^(education|academics?|academic background|qualifications?|(?:work |professional )?experience|"
+    r"employment(?: history)?|work history|(?:technical )?skills|projects|certifications?|awards|"
+    r"publications|summary|profile|languages|interests)$"
+)
+EDUCATION_SECTIONS = ("education", "academic", "qualification")
+EDUCATION_LINE_RE = re.compile(
+    r"\b(b\.?\s?tech|m\.?\s?tech|b\.?\s?sc|m\.?\s?sc|[bm]\.[aes]\.?|[bm][as] in|mba|ph\.?\s?d|"
+    r"bachelor'?s?|masters?'? (?:of|in|degree)|doctorate|degree|diploma|university|college|school|"
+    r"institute|academy|c?gpa)(?!\w)"
+)
+
+
+def normalize_skill(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every taxonomy alias: one pass over the text
+    finds all aliases at once, whatever the size of the taxonomy. A hit only
+    counts on word boundaries, so "java" does not match inside "javascript".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Tuple[str, List[str]]]):
+        self.categories = {skill: category for skill, (category, _) in taxonomy.items()}
+        self.aliases: Dict[str, str] = {}
+        for skill, (_, aliases) in taxonomy.items():
+            for alias in aliases:
+                self.aliases.setdefault(normalize_skill(alias), skill)
+
+        # trie: per-node transitions, failure links and (alias length, skill) outputs
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[int, str]]] = [[]]
+        for alias, skill in self.aliases.items():
+            node = 0
+            for ch in alias:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.out[node].append((len(alias), skill))
+
+        # failure links breadth-first; depth-1 nodes fail to the root
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def find(self, text: str) -> Dict[str, int]:
+        """canonical skill → number of mentions in `text`"""
+        text = " ".join(text.lower().split())
+        hits: List[Tuple[int, int, str]] = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, skill in self.out[node]:
+                start, end = i - length + 1, i + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                hits.append((start, -length, skill))
+
+        # leftmost-longest: a hit inside a longer one is not a mention of its own
+        # ("react" in "react native", "react" in "react.js")
+        found: Dict[str, int] = {}
+        covered = 0
+        for start, neg_length, skill in sorted(hits):
+            if start < covered:
+                continue
+            covered = start - neg_length
+            found[skill] = found.get(skill, 0) + 1
+        return found
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Taxonomy skill for an exact alias (e.g. from the LLM pass), else None."""
+        name = normalize_skill(name)
+        return self.aliases.get(name) or (name if name in self.categories else None)
+
+    def category(self, skill: str) -> str:
+        return self.categories.get(skill, "other")
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher() -> SkillMatcher:
+    taxonomy = dict(SKILL_TAXONOMY)
+    if settings.skills_taxonomy_path:
+        with open(settings.skills_taxonomy_path, "r", encoding="utf-8") as f:
+            taxonomy.update({skill: tuple(entry) for skill, entry in json.load(f).items()})
+    return SkillMatcher(taxonomy)
+
+
+def career_lines(text: str) -> List[str]:
+    """Lowercased lines of `text` outside the Education section and degree lines."""
+    lines = []
+    in_education = False
+    for line in text.lower().splitlines():
+        title = line.strip().strip("#*_:|").strip()
+        if SECTION_TITLE_RE.match(title):
+            in_education = title.startswith(EDUCATION_SECTIONS)
+            continue
+        if not in_education and not EDUCATION_LINE_RE.search(line):
+            lines.append(line)
+    return lines
+
+
+def role_lines(text: str) -> List[str]:
+    """Lowercased heading and title lines of `text`: short, and not bullets."""
+    lines = []
+    for line in text.lower().splitlines():
+        if BULLET_RE.match(line):
+            continue
+        line = line.strip().strip("#*_|").strip()
+        if line and len(line.split()) <= ROLE_LINE_MAX_WORDS:
+            lines.append(line)
+    return lines
+
+
+def extract_years(text: str) -> Optional[float]:
+    """
+    Career length: the larger of stated "N years" and the span of dated
+    roles, ignoring education dates.
+    """
+    text = "\n".join(career_lines(text))
+    stated = [float(y) for y in YEARS_STATED_RE.findall(text) if float(y) <= MAX_CAREER_YEARS]
+    this_year = date.today().year
+    starts, ends = [], []
+    for start, end in YEAR_RANGE_RE.findall(text):
+        start = int(start)
+        end = this_year if not end.isdigit() else int(end)
+        if start <= end <= this_year:
+            starts.append(start)
+            ends.append(end)
+    spans = [float(max(ends) - min(starts))] if starts else []
+    years = [y for y in stated + spans if y <= MAX_CAREER_YEARS]
+    return max(years) if years else None
+
+
+def extract_seniority(text: str, years: Optional[float]) -> Optional[str]:
+    lines = role_lines(text)
+    for level, pattern in SENIORITY_PATTERNS:
+        for line in lines:
+            if any(not PROSE_BEFORE_TITLE_RE.search(line[:m.start()]) for m in pattern.finditer(line)):
+                return level
+    if years is None:
+        return None
+    if years < 2:
+        return "junior"
+    if years < 5:
+        return "mid"
+    return "senior" if years < 10 else "lead"
+
+
+@dataclass
+class SkillProfile:
+    """Skills (canonical name → (category, mentions, source)) plus career level of one resume."""
+    skills: Dict[str, Tuple[str, int, str]] = field(default_factory=dict)
+    seniority: Optional[str] = None
+    years_experience: Optional[float] = None
+
+    def add_llm_skills(self, names: Iterable[str], matcher: SkillMatcher):
+        """Merge LLM-extracted skills; dictionary hits keep their counts."""
+        for name in names:
+            skill = matcher.canonical(name) or normalize_skill(name)
+            if skill and skill not in self.skills:
+                self.skills[skill] = (matcher.category(skill), 1, "llm")
+
+
+def extract_profile(text: str) -> SkillProfile:
+    matcher = get_skill_matcher()
+    years = extract_years(text)
+    return SkillProfile(
+        skills={s: (matcher.category(s), n, "dictionary") for s, n in matcher.find(text).items()},
+        seniority=extract_seniority(text, years),
+        years_experience=years,
+    )
+
+
+# The head of a resume carries most of its skills; keeps the optional pass cheap
+SKILLS_RESUME_MAX_TOKENS = 3000
+
+SKILLS_PROMPT = """
+List the professional skills, technologies and tools this person has
+actually used, as short canonical names (e.g. "python", "kubernetes",
+"people management"). Return one comma-separated line and nothing else.
+
+Resume:
+{text}
+"""
+
+
+@lru_cache(maxsize=None)
+def skills_llm() -> ChatOpenAI:
+    return ChatOpenAI(
+        model="gpt-4o-mini", temperature=0, timeout=settings.summary_timeout,
+        max_retries=settings.summary_max_retries, cache=llm_cache("skills_extraction"),
+    )
+
+
+def extract_skills_llm(resume_texts: List[str]) -> List[Optional[List[str]]]:
+    """
+    Skill names per resume, at most `summary_concurrency` requests in flight.
+    A failed item yields None; the dictionary matcher's skills still stand.
+    """
+    if not resume_texts:
+        return []
+    responses = skills_llm().batch(
+        [SKILLS_PROMPT.format(text=truncate_tokens(t, SKILLS_RESUME_MAX_TOKENS)) for t in resume_texts],
+        config={"max_concurrency": settings.summary_concurrency},
+        return_exceptions=True,
+    )
+    skills = []
+    for response in responses:
+        if isinstance(response, Exception):
+            print(f"Skill extraction failed: {response!r}")
+            skills.append(None)
+        else:
+            skills.append([s.strip(" .\"'") for s in response.content.split(",") if s.strip(" .\"'")])
+    return skills
+
+
+DELETE_SKILLS_SQL = text("DELETE FROM employee_skills WHERE resume_id = ANY(:resume_ids)")
+
+
+def write_skills(db: Session, profiles: Dict[int, SkillProfile]):
+    """Replace the skill rows of these resumes; the caller owns the transaction."""
+    if not profiles:
+        return
+    db.execute(DELETE_SKILLS_SQL, {"resume_ids": list(profiles)})
+    rows = [
+        {
+            "resume_id": resume_id,
+            "skill": skill,
+            "category": category,
+            "mentions": mentions,
+            "source": source,
+            "seniority": profile.seniority,
+            "years_experience": profile.years_experience,
+        }
+        for resume_id, profile in profiles.items()
+        for skill, (category, mentions, source) in profile.skills.items()
+    ]
+    if rows:
+        # executemany: one multi-VALUES statement would hit the 65535 bind parameter cap
+        db.execute(insert(EmployeeSkill), rows)
+
+
+PROFILED_EMPLOYEES_SQL = text("""
+    SELECT COUNT(DISTINCT r.employee_email)
+    FROM resumes r
+    WHERE EXISTS (SELECT 1 FROM employee_skills es WHERE es.resume_id = r.id)
+""")
+
+# Per requested skill: who has it, how many of them are senior, typical experience
+SKILL_COVERAGE_SQL = text("""
+    SELECT es.skill,
+           MIN(es.category) AS category,
+           COUNT(DISTINCT r.employee_email) AS employees,
+           COUNT(DISTINCT r.employee_email)
+               FILTER (WHERE es.seniority IN ('senior', 'lead', 'principal')) AS senior_employees,
+           ROUND(AVG(es.years_experience)::numeric, 1) AS avg_years,
+           (array_agg(e.name ORDER BY es.mentions DESC, es.years_experience DESC NULLS LAST))[1:CAST(:limit AS int)] AS top_people
+    FROM employee_skills es
+    JOIN resumes r ON r.id = es.resume_id
+    JOIN employees e ON e.email = r.employee_email
+    WHERE es.skill = ANY(:skills)
+    GROUP BY es.skill
+""")
+
+# People covering the most requested skills ("who knows X and Y")
+BEST_MATCHES_SQL = text("""
+    SELECT e.name,
+           e.email,
+           COUNT(DISTINCT es.skill) AS matched,
+           array_agg(DISTINCT es.skill) AS skills,
+           MAX(es.years_experience) AS years_experience
+    FROM employee_skills es
+    JOIN resumes r ON r.id = es.resume_id
+    JOIN employees e ON e.email = r.employee_email
+    WHERE es.skill = ANY(:skills)
+    GROUP BY e.name, e.email
+    ORDER BY matched DESC, years_experience DESC NULLS LAST
+    LIMIT :limit
+""")
+
+
+async def profiled_employees(db: AsyncSession) -> int:
+    return (await db.execute(PROFILED_EMPLOYEES_SQL)).scalar_one()
+
+
+async def skill_coverage(db: AsyncSession, skills: List[str], limit: int = 5) -> Dict[str, Dict]:
+    """skill → coverage row; skills nobody has are absent."""
+    if not skills:
+        return {}
+    rows = (await db.execute(SKILL_COVERAGE_SQL, {"skills": skills, "limit": limit})).mappings()
+    return {row["skill"]: dict(row) for row in rows}
+
+
+async def best_matches(db: AsyncSession, skills: List[str], limit: int = 5) -> List[Dict]:
+    if not skills:
+        return []
+    rows = (await db.execute(BEST_MATCHES_SQL, {"skills": skills, "limit": limit})).mappings()
+    return [dict(row) for row in rows]
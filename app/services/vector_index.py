@@ -0,0 +1,257 @@
+import fcntl
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import VECTOR_DIM
+
+EMBEDDINGS_FILE = "embeddings.f32"
+IDS_FILE = "ids.i64"  # (chunk_id, resume_id) per row
+TOMBSTONES_FILE = "tombstones.i64"  # chunk ids deleted since the last export
+LOCK_FILE = ".lock"  # readers (shared) vs. file changes (exclusive), held briefly
+WRITER_LOCK_FILE = ".writer.lock"  # one writer at a time, held for a whole export
+
+EXPORT_SQL = text("""
+    SELECT id, resume_id, embedding::text AS embedding
+    FROM resume_chunks
+    WHERE embedding IS NOT NULL
+    ORDER BY id
+""")
+
+
+class VectorIndexMissingError(RuntimeError):
+    """Incremental update of an index that was never exported."""
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class MemmapVectorIndex:
+    """
+    All chunk embeddings in one memory-mapped float32 matrix (L2-normalized,
+    so cosine similarity is a dot product) with a parallel (chunk_id,
+    resume_id) array. Files are opened read-only, so every Uvicorn worker on
+    the host shares the same page-cache pages. Writers append rows and
+    tombstone deleted chunk ids under an exclusive file lock; readers notice
+    the larger files on their next search and remap. Writers also serialize
+    on a separate lock, which an export holds from its DB read to the file
+    swap, so concurrent appends wait for it instead of being overwritten.
+    """
+
+    def __init__(self, path: str, dim: int = VECTOR_DIM):
+        self.path = path
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._version: Tuple = ()
+        self.embeddings = np.zeros((0, dim), dtype=np.float32)
+        self.ids = np.zeros((0, 2), dtype=np.int64)
+        self.alive = np.ones(0, dtype=bool)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self, mode: int, name: str = LOCK_FILE):
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._file(name), "a") as f:
+            fcntl.flock(f, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write_lock(self):
+        return self._file_lock(fcntl.LOCK_EX)
+
+    def _writer_lock(self):
+        return self._file_lock(fcntl.LOCK_EX, WRITER_LOCK_FILE)
+
+    def _require_export(self):
+        if not self.exists():
+            raise VectorIndexMissingError(
+                f"No vector index in {self.path}; run `python -m ingestion.export_vector_index` first"
+            )
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.ids)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._file(IDS_FILE))
+
+    # ---------- reading ----------
+
+    def _current_version(self) -> Tuple:
+        # inode changes on export (files are replaced), size on append/delete
+        ids_stat = os.stat(self._file(IDS_FILE))
+        tomb_path = self._file(TOMBSTONES_FILE)
+        tomb_size = os.path.getsize(tomb_path) if os.path.exists(tomb_path) else 0
+        return (ids_stat.st_ino, ids_stat.st_size, tomb_size)
+
+    def version(self) -> Tuple:
+        """Changes whenever the index contents do (append, delete, export)."""
+        return self._current_version() if self.exists() else ()
+
+    def refresh(self):
+        """(Re)map the files if they changed since the last look."""
+        if not self.exists() or self._current_version() == self._version:
+            return
+
+        # shared lock: never map a half-replaced pair of files
+        with self._lock, self._file_lock(fcntl.LOCK_SH):
+            version = self._current_version()
+            ino, ids_size, tomb_size = version
+            rows = ids_size // (2 * 8)
+            if rows:
+                embeddings = np.memmap(self._file(EMBEDDINGS_FILE), dtype=np.float32, mode="r",
+                                       shape=(rows, self.dim))
+                ids = np.memmap(self._file(IDS_FILE), dtype=np.int64, mode="r", shape=(rows, 2))
+            else:
+                embeddings = np.zeros((0, self.dim), dtype=np.float32)
+                ids = np.zeros((0, 2), dtype=np.int64)
+
+            alive = np.ones(rows, dtype=bool)
+            if tomb_size:
+                dead = np.fromfile(self._file(TOMBSTONES_FILE), dtype=np.int64)
+                alive &= ~np.isin(ids[:, 0], dead)
+
+            self.embeddings, self.ids, self.alive, self._version = embeddings, ids, alive, version
+
+    def search(
+        self,
+        query: List[float],
+        top_k: int,
+        snippets: int = 3,
+        candidates: Optional[int] = None,
+        after: Tuple[Optional[float], Optional[int]] = (None, None),
+    ) -> List[Dict]:
+        """
+        Top-k resumes by best chunk cosine distance. Returns dicts with
+        resume_id, score (distance) and `chunks`: [(chunk_id, distance), ...]
+        for up to `snippets` best chunks, ordered by (score, resume_id).
+        """
+        self.refresh()
+        embeddings, ids, alive = self.embeddings, self.ids, self.alive
+        n = len(ids)
+        if n == 0:
+            return []
+
+        q = _normalize(np.asarray(query, dtype=np.float32))
+        distances = 1.0 - embeddings @ q
+        distances[~alive] = np.inf
+
+        candidates = min(candidates or top_k * settings.search_candidate_multiplier, n)
+        while True:
+            idx = np.argpartition(distances, candidates - 1)[:candidates] if candidates < n else np.arange(n)
+            idx = idx[np.isfinite(distances[idx])]
+            # best chunks first, then stable group by resume
+            idx = idx[np.lexsort((ids[idx, 0], distances[idx]))]
+            resume_ids = ids[idx, 1]
+            best = self._per_resume(idx, resume_ids, distances, after)
+            if len(best) >= top_k or candidates >= n:
+                break
+            candidates = min(candidates * 4, n)
+
+        results = []
+        for resume_id, score in best[:top_k]:
+            mask = resume_ids == resume_id
+            chunk_idx = idx[mask][:snippets]
+            results.append({
+                "resume_id": int(resume_id),
+                "score": float(score),
+                "chunks": [(int(ids[i, 0]), float(distances[i])) for i in chunk_idx],
+            })
+        return results
+
+    @staticmethod
+    def _per_resume(idx, resume_ids, distances, after) -> List[Tuple[int, float]]:
+        # idx is sorted by distance, so the first hit per resume is its best chunk
+        unique_ids, first = np.unique(resume_ids, return_index=True)
+        scores = distances[idx[first]]
+        order = np.lexsort((unique_ids, scores))
+        best = [(int(unique_ids[i]), float(scores[i])) for i in order]
+        if after[0] is not None:
+            best = [(rid, s) for rid, s in best if (s, rid) > (after[0], after[1])]
+        return best
+
+    # ---------- writing ----------
+
+    def append(self, chunk_ids: Iterable[int], resume_ids: Iterable[int], vectors):
+        chunk_ids = np.asarray(list(chunk_ids), dtype=np.int64)
+        if not len(chunk_ids):
+            return
+        rows = np.column_stack([chunk_ids, np.asarray(list(resume_ids), dtype=np.int64)])
+        vectors = _normalize(vectors)
+        with self._writer_lock():
+            self._require_export()
+            # a batch committed just before an export's snapshot is already in it
+            present = np.isin(chunk_ids, np.fromfile(self._file(IDS_FILE), dtype=np.int64)[::2])
+            rows, vectors = rows[~present], vectors[~present]
+            if not len(rows):
+                return
+            with self._write_lock():
+                # embeddings first: readers size the index off ids.i64
+                with open(self._file(EMBEDDINGS_FILE), "ab") as f:
+                    f.write(vectors.tobytes())
+                with open(self._file(IDS_FILE), "ab") as f:
+                    f.write(rows.tobytes())
+
+    def delete(self, chunk_ids: Iterable[int]):
+        chunk_ids = np.asarray(list(chunk_ids), dtype=np.int64)
+        if not len(chunk_ids):
+            return
+        with self._writer_lock():
+            self._require_export()
+            with self._write_lock():
+                with open(self._file(TOMBSTONES_FILE), "ab") as f:
+                    f.write(chunk_ids.tobytes())
+
+    def export(self, db: Session, batch_size: int = 10_000) -> int:
+        """
+        Rebuild the files from resume_chunks (drops tombstones). Appends and
+        deletes wait for the whole export; readers only for the file swap.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        tmp_emb = self._file(EMBEDDINGS_FILE + ".tmp")
+        tmp_ids = self._file(IDS_FILE + ".tmp")
+
+        count = 0
+        with self._writer_lock():
+            # the snapshot is taken after the lock: anything committed later is appended after the swap
+            db.rollback()
+            result = db.execute(EXPORT_SQL.execution_options(yield_per=batch_size))
+            with open(tmp_emb, "wb") as emb_f, open(tmp_ids, "wb") as ids_f:
+                for rows in result.partitions(batch_size):
+                    vectors = np.array(
+                        [r.embedding[1:-1].split(",") for r in rows], dtype=np.float32
+                    )
+                    emb_f.write(_normalize(vectors).tobytes())
+                    ids_f.write(np.array([(r.id, r.resume_id) for r in rows], dtype=np.int64).tobytes())
+                    count += len(rows)
+
+            with self._write_lock():
+                os.replace(tmp_emb, self._file(EMBEDDINGS_FILE))
+                os.replace(tmp_ids, self._file(IDS_FILE))
+                if os.path.exists(self._file(TOMBSTONES_FILE)):
+                    os.remove(self._file(TOMBSTONES_FILE))
+        return count
+
+
+_index: Optional[MemmapVectorIndex] = None
+
+
+def get_vector_index() -> MemmapVectorIndex:
+    global _index
+    if _index is None:
+        _index = MemmapVectorIndex(settings.vector_index_dir)
+    return _index
@@ -0,0 +1,118 @@
+"""
+Recall@k and latency of the ANN index on resume_chunks.embedding versus
+exact (sequential scan) search. With VECTOR_COMPACT_MODE set, the ANN side is
+the compact-index shortlist rescored on full vectors.
+
+    python -m benchmarks.ann_recall --k 10 --queries 200 --ef-search 20 40 80 200
+
+Query vectors are sampled from stored chunk embeddings, so the harness needs
+no embedding API calls. For each ef_search / probes value it reports mean
+recall@k against the exact top-k together with p50/p99 query latency.
+"""
+import argparse
+import statistics
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.vector_compact import compact_mode
+from app.services.semantic_search import nearest_chunks_sql, scan_window, set_ann_params
+from db.session import SessionLocal
+
+SAMPLE_SQL = text("""
+    SELECT embedding::text AS embedding
+    FROM resume_chunks
+    WHERE embedding IS NOT NULL
+    ORDER BY random()
+    LIMIT :n
+""")
+
+EXACT_KNN_SQL = text("""
+    SELECT id
+    FROM resume_chunks
+    ORDER BY embedding <=> CAST(:embedding AS vector)
+    LIMIT :k
+""")
+
+KNN_SQL = text("""
+    SELECT n.id
+    FROM (""" + nearest_chunks_sql("CAST(:embedding AS vector)", "rc.id") + """) n
+    ORDER BY n.distance
+""")
+
+EXACT_SQL = text("SET LOCAL enable_indexscan = off")
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    idx = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def knn(db: Session, embedding: str, k: int, exact: bool = False,
+        ef_search: Optional[int] = None, probes: Optional[int] = None):
+    start = time.perf_counter()
+    if exact:
+        db.execute(EXACT_SQL)
+        ids = [row[0] for row in db.execute(EXACT_KNN_SQL, {"embedding": embedding, "k": k})]
+    else:
+        set_ann_params(db, ef_search=ef_search, probes=probes)
+        shortlist = scan_window(k)
+        ids = [row[0] for row in db.execute(KNN_SQL, {
+            "embedding": embedding, "candidates": k, "shortlist": shortlist,
+        })]
+    elapsed = time.perf_counter() - start
+    db.rollback()  # SET LOCAL / set_config only last for the transaction
+    return ids, elapsed
+
+
+def run(k: int, n_queries: int, ef_values: List[int], probe_values: List[int]):
+    db = SessionLocal()
+    try:
+        queries = [row[0] for row in db.execute(SAMPLE_SQL, {"n": n_queries})]
+        db.rollback()
+        if not queries:
+            print("No embeddings in resume_chunks; ingest some resumes first.")
+            return
+
+        exact, exact_times = [], []
+        for q in queries:
+            ids, elapsed = knn(db, q, k, exact=True)
+            exact.append(set(ids))
+            exact_times.append(elapsed)
+
+        print(f"{len(queries)} queries, k={k}, index type={settings.vector_index_type}, "
+              f"compact={compact_mode()}")
+        print(f"{'setting':<18}{'recall@k':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        print(f"{'exact':<18}{1.0:>10.3f}{percentile(exact_times, 50) * 1000:>10.2f}"
+              f"{percentile(exact_times, 99) * 1000:>10.2f}")
+
+        if settings.vector_index_type == "ivfflat":
+            settings_to_try = [("probes", p) for p in probe_values]
+        else:
+            settings_to_try = [("ef_search", ef) for ef in ef_values]
+
+        for name, value in settings_to_try:
+            recalls, times = [], []
+            for q, truth in zip(queries, exact):
+                ids, elapsed = knn(db, q, k, **{name: value})
+                recalls.append(len(truth & set(ids)) / len(truth) if truth else 1.0)
+                times.append(elapsed)
+            print(f"{f'{name}={value}':<18}{statistics.mean(recalls):>10.3f}"
+                  f"{percentile(times, 50) * 1000:>10.2f}{percentile(times, 99) * 1000:>10.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ANN recall@k vs exact search")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[20, 40, 80, 160, 320])
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 5, 10, 20, 50])
+    args = parser.parse_args()
+
+    run(args.k, args.queries, args.ef_search, args.probes)
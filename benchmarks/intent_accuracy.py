@@ -0,0 +1,85 @@
+"""
+Accuracy and latency of the keyword-rule intent fast path against the LLM
+classifier, whose labels are taken as ground truth.
+
+    python -m benchmarks.intent_accuracy --queries-file my_queries.txt --margin 1 2 3
+
+Queries are the "- " lines of agent_queries_samples.txt plus any extra files
+(one query per line). For each margin it reports how many queries the rules
+answer on their own (coverage), how often those answers agree with the LLM,
+and the resulting mean classification latency.
+"""
+import argparse
+import statistics
+import time
+from collections import Counter
+from typing import List
+
+from app.agents.nodes.intent import fast_classify, llm_classify, rule_scores
+from app.core.config import settings
+from benchmarks.ann_recall import percentile
+
+SAMPLES_FILE = "agent_queries_samples.txt"
+
+
+def load_queries(extra_files: List[str]) -> List[str]:
+    with open(SAMPLES_FILE) as f:
+        queries = [line[2:].strip() for line in f if line.startswith("- ")]
+    for path in extra_files:
+        with open(path) as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    return list(dict.fromkeys(queries))
+
+
+def run(queries: List[str], margins: List[int]):
+    labels, llm_times = [], []
+    for q in queries:
+        start = time.perf_counter()
+        labels.append(llm_classify(q))
+        llm_times.append(time.perf_counter() - start)
+
+    rule_times = []
+    for q in queries:
+        start = time.perf_counter()
+        rule_scores(q)
+        rule_times.append(time.perf_counter() - start)
+
+    llm_mean = statistics.mean(llm_times)
+    print(f"{len(queries)} queries; LLM p50 {percentile(llm_times, 50) * 1000:.0f} ms, "
+          f"p99 {percentile(llm_times, 99) * 1000:.0f} ms; "
+          f"rules p50 {percentile(rule_times, 50) * 1e6:.0f} us")
+    print(f"{'margin':<8}{'coverage':>10}{'accuracy':>10}{'mean ms':>10}")
+
+    for margin in margins:
+        settings.intent_fast_path_margin = margin
+        decided = correct = 0
+        confusions = Counter()
+        for q, label in zip(queries, labels):
+            intent, _ = fast_classify(q)
+            if intent is None:
+                continue
+            decided += 1
+            if intent == label:
+                correct += 1
+            else:
+                confusions[(label, intent)] += 1
+        coverage = decided / len(queries)
+        accuracy = correct / decided if decided else 1.0
+        # fast-path hits cost ~nothing, everything else still pays the LLM call
+        mean_ms = (1 - coverage) * llm_mean * 1000
+        print(f"{margin:<8}{coverage:>10.2f}{accuracy:>10.2f}{mean_ms:>10.0f}")
+        for (label, intent), count in confusions.most_common(5):
+            print(f"    llm={label} rules={intent}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent fast path vs LLM labels")
+    parser.add_argument("--queries-file", nargs="*", default=[])
+    parser.add_argument("--margin", type=int, nargs="+", default=[1, 2, 3, 4])
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries_file)
+    if not queries:
+        print("No queries found.")
+    else:
+        run(queries, args.margin)
@@ -1,6 +1,5 @@
 import chainlit as cl
-from app.agents.hr_agent import hr_agent
-from app.agents.state import AgentState
+from app.agents.streaming import stream_agent
 
 
 @cl.on_chat_start
@@ -29,30 +28,27 @@ async def main(message: cl.Message):
     await msg.send()
 
     try:
-        # Initialize agent state
-        state: AgentState = {
-            "query": message.content,
-            "intent": "",
-            "retrieved_chunks": [],
-            "resumes": [],
-            "calendar_info": None,
-            "talent_gap": None,
-            "answer": None,
-            "structured_output": None,
-        }
-
         # Update message to show processing
         msg.content = "🤔 Processing your query..."
         await msg.update()
 
-        # Invoke the HR agent
-        result = hr_agent.invoke(state)
-
-        # Extract the answer
-        answer = result.get("answer", "Sorry, I couldn't generate an answer.")
+        # Run the HR agent, rendering progress and answer tokens as they arrive
+        streaming = False
+        result = {}
+        async for event in stream_agent(message.content):
+            if event["event"] == "node" and event["status"] == "start" and not streaming:
+                msg.content = f"🤔 {event['label']}..."
+                await msg.update()
+            elif event["event"] == "token":
+                if not streaming:
+                    streaming = True
+                    msg.content = ""
+                await msg.stream_token(event["content"])
+            elif event["event"] == "answer":
+                result = event
 
-        # Update the message with the final answer
-        msg.content = answer
+        # The final answer is authoritative (some nodes reformat the streamed text)
+        msg.content = result.get("answer") or "Sorry, I couldn't generate an answer."
         await msg.update()
 
         # Optionally show additional metadata
@@ -4,12 +4,27 @@ This approach avoids dependency conflicts between Chainlit and the main applicat
 """
 import chainlit as cl
 import httpx
+import json
 import os
 
 
 # API endpoint configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://api:8000")
 RAG_ENDPOINT = f"{API_BASE_URL}/api/v1/search/rag-agent"
+RAG_STREAM_ENDPOINT = f"{RAG_ENDPOINT}/stream"
+
+
+async def sse_events(response: httpx.Response):
+    """Parse a text/event-stream response into its JSON `data` payloads."""
+    data = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield json.loads("\n".join(data))
+            data = []
+    if data:
+        yield json.loads("\n".join(data))
 
 
 @cl.on_chat_start
@@ -41,17 +56,32 @@ async def main(message: cl.Message):
         msg.content = "🤔 Processing your query..."
         await msg.update()
 
-        # Call the RAG agent endpoint
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                RAG_ENDPOINT,
+        # Stream the RAG agent endpoint: progress, then answer tokens as generated
+        streaming = False
+        result = {}
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, read=None)) as client:
+            async with client.stream(
+                "POST",
+                RAG_STREAM_ENDPOINT,
                 json={"query": message.content}
-            )
-            response.raise_for_status()
-            result = response.json()
+            ) as response:
+                response.raise_for_status()
+                async for event in sse_events(response):
+                    if event["event"] == "node" and event["status"] == "start" and not streaming:
+                        msg.content = f"🤔 {event['label']}..."
+                        await msg.update()
+                    elif event["event"] == "token":
+                        if not streaming:
+                            streaming = True
+                            msg.content = ""
+                        await msg.stream_token(event["content"])
+                    elif event["event"] == "answer":
+                        result = event
+                    elif event["event"] == "error":
+                        raise RuntimeError(event["error"])
 
-        # Extract the answer
-        answer = result.get("answer", "Sorry, I couldn't generate an answer.")
+        # The final answer is authoritative (some nodes reformat the streamed text)
+        answer = result.get("answer") or "Sorry, I couldn't generate an answer."
 
         # Update the message with the final answer
         msg.content = answer
@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, func
+from db.base import Base
+
+class CorpusVersion(Base):
+    """Single row bumped by every ingestion commit; search result cache keys include it."""
+    __tablename__ = "corpus_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, Integer, String, func
+from pgvector.sqlalchemy import Vector
+from db.base import Base
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    model = Column(String, primary_key=True)
+    text_hash = Column(String(64), primary_key=True)  # sha256 of whitespace-normalized text
+    embedding = Column(Vector(1536), nullable=False)
+    hits = Column(Integer, nullable=False, server_default="0")
+    last_used_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from db.base import Base
+
+class EmployeeSkill(Base):
+    """
+    One normalized skill found in a resume. `seniority` and `years_experience`
+    describe the resume as a whole and are repeated on each of its rows so
+    coverage queries never need a second table.
+    """
+    __tablename__ = "employee_skills"
+
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True, index=True)  # canonical taxonomy name
+    category = Column(String, nullable=False)
+    mentions = Column(Integer, nullable=False, server_default="1")
+    source = Column(String, nullable=False, server_default="dictionary")  # dictionary | llm
+    seniority = Column(String, nullable=True)
+    years_experience = Column(Float, nullable=True)
@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 from db.base import Base
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        UniqueConstraint("employee_email", "file_path", name="uq_resumes_employee_email_file_path"),
+    )
 
     id = Column(Integer, primary_key=True)
     file_path = Column(String, nullable=False)
     text_md = Column(String, nullable=False)  # full extracted markdown
+    content_hash = Column(String(64), nullable=True)  # sha256 of the source file bytes
     employee_email = Column(String, ForeignKey("employees.email"), nullable=False)
     employee = relationship("Employee", backref="resumes")
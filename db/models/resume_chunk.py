@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text
+from sqlalchemy import Column, Computed, Integer, ForeignKey, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from pgvector.sqlalchemy import Vector
 from db.base import Base
@@ -9,6 +10,9 @@ class ResumeChunk(Base):
     id = Column(Integer, primary_key=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
     chunk_text = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # sha256 of chunk_text
     embedding = Column(Vector(1536))  # text-embedding-3-small dim size
+    # full-text leg of hybrid search (GIN indexed)
+    chunk_tsv = Column(TSVECTOR, Computed("to_tsvector('english', chunk_text)", persisted=True))
 
     resume = relationship("Resume", backref="chunks")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from db.base import Base
+
+class ResumeSummary(Base):
+    """LLM summary of one version of a resume under one summary prompt version."""
+    __tablename__ = "resume_summaries"
+
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)  # resumes.content_hash it was generated from
+    prompt_version = Column(String, primary_key=True)
+    model = Column(String, nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
@@ -6,9 +7,33 @@ engine = create_engine(settings.database_url, future=True)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# psycopg 3 is natively asyncio-capable, so the same postgresql+psycopg URL
+# serves the async request path
+async_engine = create_async_engine(
+    settings.database_url,
+    pool_size=settings.db_async_pool_size,
+    max_overflow=settings.db_async_max_overflow,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def release_connection(db: AsyncSession):
+    """
+    End the session's transaction so its pooled connection goes back to the
+    pool before a slow network await (LLM, embeddings API); the next query
+    checks one out again. Call it only with nothing left to write.
+    """
+    await db.commit()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
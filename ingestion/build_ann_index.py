@@ -0,0 +1,65 @@
+"""
+Build the ANN index search queries use, from Settings: the full-precision
+index (VECTOR_COMPACT_MODE=none) or the compact halfvec/binary expression
+index (VECTOR_COMPACT_MODE / VECTOR_COMPACT_DIM), with VECTOR_INDEX_TYPE,
+VECTOR_INDEX_M / _EF_CONSTRUCTION / _LISTS.
+
+    python -m ingestion.build_ann_index [--drop-full]
+
+Migrations create a fixed HNSW full-precision index; this swaps in a
+differently built one without blocking writes: the new index is built
+CONCURRENTLY under a temporary name, then replaces the old one. The API
+refuses to start when the index for its configured mode is missing.
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.vector_compact import (
+    COMPACT_INDEX_OPS, FULL_INDEX_NAME, ann_index_name, compact_expression, compact_mode,
+)
+from db.session import engine
+
+
+def index_method(opclass: str, expression: str) -> str:
+    if settings.vector_index_type == "ivfflat":
+        return (f"USING ivfflat ({expression} {opclass}) "
+                f"WITH (lists = {int(settings.vector_index_lists)})")
+    if settings.vector_index_type == "hnsw":
+        return (f"USING hnsw ({expression} {opclass}) "
+                f"WITH (m = {int(settings.vector_index_m)}, "
+                f"ef_construction = {int(settings.vector_index_ef_construction)})")
+    raise ValueError(f"Unknown vector_index_type: {settings.vector_index_type}")
+
+
+def rebuild(conn, name: str, method: str):
+    tmp = f"{name}_new"
+    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {tmp}"))
+    conn.execute(text(f"CREATE INDEX CONCURRENTLY {tmp} ON resume_chunks {method}"))
+    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    conn.execute(text(f"ALTER INDEX {tmp} RENAME TO {name}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the ANN index for the configured compact mode")
+    parser.add_argument("--drop-full", action="store_true",
+                        help="with a compact mode, drop the full-precision index to save memory "
+                             "(VECTOR_COMPACT_MODE=none then needs a rebuild)")
+    args = parser.parse_args()
+
+    mode = compact_mode()
+    name = ann_index_name(mode)
+    if mode == "none":
+        method = index_method("vector_cosine_ops", "embedding")
+    else:
+        method = index_method(COMPACT_INDEX_OPS[mode], f"({compact_expression('embedding', mode)})")
+
+    start = time.perf_counter()
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        rebuild(conn, name, method)
+        if args.drop_full and mode != "none":
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {FULL_INDEX_NAME}"))
+    print(f"Built {name} ({settings.vector_index_type}) in {time.perf_counter() - start:.2f}s")
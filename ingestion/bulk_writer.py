@@ -0,0 +1,191 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from pgvector.psycopg import register_vector
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from db.models.employee import Employee
+from db.models.resume import Resume
+from app.services.search_cache import bump_corpus_version
+from app.services.skills import SkillProfile, write_skills
+
+
+@dataclass
+class ResumeRecord:
+    """One extracted resume, ready to be written."""
+    employee_name: str
+    email: str
+    employeeid: Optional[str]
+    file_path: str
+    text: str
+    content_hash: str
+    chunks: Dict[str, str]  # chunk hash → chunk text (full new version of the file)
+    embeddings: Dict[str, List[float]] = field(default_factory=dict)  # only hashes not yet stored
+    skills: Optional[SkillProfile] = None  # replaces the resume's employee_skills rows when set
+
+
+DELETE_STALE_CHUNKS_SQL = text("""
+    DELETE FROM resume_chunks rc
+    WHERE rc.resume_id = ANY(:resume_ids)
+      AND NOT EXISTS (
+          SELECT 1
+          FROM unnest(CAST(:keep_ids AS int[]), CAST(:keep_hashes AS text[])) AS k(resume_id, content_hash)
+          WHERE k.resume_id = rc.resume_id AND k.content_hash = rc.content_hash
+      )
+    RETURNING rc.id
+""")
+
+# A file re-ingested under another email (e.g. edited PDF metadata) is the same
+# resume under a new identity: the row(s) it supersedes go, chunks first (no cascade)
+SUPERSEDED_RESUMES_SQL = """
+    SELECT r.id
+    FROM resumes r
+    JOIN unnest(CAST(:emails AS text[]), CAST(:paths AS text[])) AS k(employee_email, file_path)
+      ON r.file_path = k.file_path AND r.employee_email <> k.employee_email
+"""
+DELETE_SUPERSEDED_CHUNKS_SQL = text(f"""
+    DELETE FROM resume_chunks WHERE resume_id IN ({SUPERSEDED_RESUMES_SQL}) RETURNING id
+""")
+DELETE_SUPERSEDED_RESUMES_SQL = text(f"""
+    DELETE FROM resumes WHERE id IN ({SUPERSEDED_RESUMES_SQL})
+""")
+
+# COPY cannot return generated keys, so ids are reserved up front
+RESERVE_CHUNK_IDS_SQL = text("""
+    SELECT nextval(pg_get_serial_sequence('resume_chunks', 'id'))
+    FROM generate_series(1, :n)
+""")
+
+COPY_CHUNKS_SQL = (
+    "COPY resume_chunks (id, resume_id, chunk_text, content_hash, embedding) "
+    "FROM STDIN WITH (FORMAT BINARY)"
+)
+
+
+class BulkResumeWriter:
+    """
+    Writes a batch of resumes in a single transaction:
+    upserts employees/resumes with INSERT ... ON CONFLICT, deletes stale
+    chunks in one statement, streams new chunks with binary COPY and
+    replaces the extracted skills of each resume. A resume is identified by
+    (employee email, file path); rows for the same file under another email
+    are deleted, so a changed metadata email replaces the old resume.
+
+    After a successful batch, `written_resume_ids`, `deleted_chunk_ids` and `written_chunks`
+    ((chunk_id, resume_id, vector) rows) describe what changed, so
+    downstream indexes can follow incrementally.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.rows_written = 0
+        self.seconds = 0.0
+        self.written_resume_ids: List[int] = []
+        self.deleted_chunk_ids: List[int] = []
+        self.written_chunks: List[tuple] = []
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+    def write_batch(self, records: List[ResumeRecord]) -> int:
+        if not records:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            identities = {"emails": [r.email for r in records], "paths": [r.file_path for r in records]}
+            deleted = self.db.execute(DELETE_SUPERSEDED_CHUNKS_SQL, identities).scalars().all()
+            self.db.execute(DELETE_SUPERSEDED_RESUMES_SQL, identities)
+            resume_ids = self._upsert(records)
+            deleted += self.db.execute(DELETE_STALE_CHUNKS_SQL, {
+                "resume_ids": list(resume_ids.values()),
+                "keep_ids": [resume_ids[(r.email, r.file_path)] for r in records for _ in r.chunks],
+                "keep_hashes": [h for r in records for h in r.chunks],
+            }).scalars().all()
+            written = self._copy_chunks(records, resume_ids)
+            write_skills(self.db, {
+                resume_ids[(r.email, r.file_path)]: r.skills for r in records if r.skills is not None
+            })
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        try:
+            bump_corpus_version(self.db)
+        except Exception as e:
+            # the batch is committed; cached search results expire by TTL instead
+            self.db.rollback()
+            print(f"Corpus version bump failed: {e}")
+
+        self.written_resume_ids = list(resume_ids.values())
+        self.deleted_chunk_ids = list(deleted)
+        self.written_chunks = written
+        chunk_rows = len(written)
+
+        elapsed = time.perf_counter() - start
+        rows = 2 * len(records) + chunk_rows
+        self.rows_written += rows
+        self.seconds += elapsed
+        print(f"Wrote {len(records)} resumes / {chunk_rows} chunks in {elapsed:.2f}s "
+              f"({rows / elapsed if elapsed else 0:.0f} rows/sec)")
+        return chunk_rows
+
+    def _upsert(self, records: List[ResumeRecord]) -> Dict[tuple, int]:
+        # ON CONFLICT cannot touch the same row twice in one statement
+        employees = {}
+        for r in records:
+            employees.setdefault(r.email, {"name": r.employee_name, "email": r.email,
+                                           "employeeid": r.employeeid})
+        stmt = insert(Employee).values(list(employees.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Employee.email],
+            set_={"employeeid": func.coalesce(Employee.employeeid, stmt.excluded.employeeid)},
+        )
+        self.db.execute(stmt)
+
+        resumes = {}
+        for r in records:
+            resumes[(r.email, r.file_path)] = {
+                "employee_email": r.email,
+                "file_path": r.file_path,
+                "text_md": r.text,
+                "content_hash": r.content_hash,
+            }
+        stmt = insert(Resume).values(list(resumes.values()))
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_resumes_employee_email_file_path",
+            set_={"text_md": stmt.excluded.text_md, "content_hash": stmt.excluded.content_hash},
+        ).returning(Resume.id, Resume.employee_email, Resume.file_path)
+
+        return {(email, path): rid for rid, email, path in self.db.execute(stmt)}
+
+    def _copy_chunks(self, records: List[ResumeRecord], resume_ids: Dict[tuple, int]) -> List[tuple]:
+        n = sum(len(r.embeddings) for r in records)
+        if not n:
+            return []
+        chunk_ids = iter(self.db.execute(RESERVE_CHUNK_IDS_SQL, {"n": n}).scalars().all())
+
+        pooled = self.db.connection().connection
+        conn = pooled.driver_connection
+        # info lives as long as the DBAPI connection, so types are registered once per connection
+        if not pooled.info.get("pgvector_registered"):
+            register_vector(conn)
+            pooled.info["pgvector_registered"] = True
+
+        written = []
+        with conn.cursor() as cur:
+            with cur.copy(COPY_CHUNKS_SQL) as copy:
+                copy.set_types(["int4", "int4", "text", "text", "vector"])
+                for r in records:
+                    rid = resume_ids[(r.email, r.file_path)]
+                    for h, vec in r.embeddings.items():
+                        chunk_id = next(chunk_ids)
+                        vec = np.asarray(vec, dtype=np.float32)
+                        copy.write_row([chunk_id, rid, r.chunks[h], h, vec])
+                        written.append((chunk_id, rid, vec))
+        return written
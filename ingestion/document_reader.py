@@ -0,0 +1,104 @@
+import os
+from typing import Dict, Iterable, Iterator, Optional
+
+import docx
+import pdfplumber
+from langchain_text_splitters import TextSplitter
+
+# --------- CONFIG ---------
+# Text kept per document; anything past this is dropped (scanned portfolios, huge CVs)
+MAX_DOC_CHARS = int(os.getenv("INGEST_MAX_DOC_CHARS", 2_000_000))
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".md")
+# --------------------------
+
+
+def default_email(filepath: str) -> str:
+    base_name = os.path.basename(filepath).split(".")[0]
+    return f"{base_name}@company.com"
+
+
+class DocumentReader:
+    """
+    Opens a document once and yields its text page by page.
+
+    `metadata` (employee email / id) is filled in as soon as iteration
+    starts, parsed page objects are released as soon as their text has been
+    taken, and reading stops once `max_chars` of text have been produced.
+    """
+
+    def __init__(self, filepath: str, max_chars: int = MAX_DOC_CHARS):
+        self.filepath = filepath
+        self.max_chars = max_chars
+        self.metadata: Dict[str, Optional[str]] = {
+            "email": default_email(filepath),
+            "employeeid": None,
+        }
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[str]:
+        ext = self.filepath.split(".")[-1].lower()
+        if ext == "pdf":
+            pages = self._pdf_pages()
+        elif ext == "md":
+            pages = self._md_pages()
+        elif ext == "docx":
+            pages = self._docx_pages()
+        else:
+            raise ValueError(f"Unsupported file type: {ext}")
+
+        remaining = self.max_chars
+        for page in pages:
+            if len(page) > remaining:
+                page = page[:remaining]
+                self.truncated = True
+            remaining -= len(page)
+            yield page
+            if remaining <= 0:
+                self.truncated = True
+                print(f"Truncated {self.filepath} at {self.max_chars} chars")
+                break
+
+    def _pdf_pages(self) -> Iterator[str]:
+        with pdfplumber.open(self.filepath) as pdf:
+            meta = pdf.metadata or {}
+            if meta.get("/employee_email"):
+                self.metadata["email"] = meta["/employee_email"]
+            if meta.get("/employee_id"):
+                self.metadata["employeeid"] = meta["/employee_id"]
+
+            for page in pdf.pages:
+                text = page.extract_text() or ""
+                # drop the parsed layout/char objects for this page
+                page.flush_cache()
+                yield text + "\n"
+
+    def _md_pages(self) -> Iterator[str]:
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            yield from f
+
+    def _docx_pages(self) -> Iterator[str]:
+        doc = docx.Document(self.filepath)
+        for p in doc.paragraphs:
+            yield p.text + "\n"
+
+
+def stream_chunks(pages: Iterable[str], splitter: TextSplitter, chunk_size: int) -> Iterator[str]:
+    """
+    Split a stream of page text without materializing the whole document.
+
+    Text is buffered until it holds a few chunks' worth, split, and every
+    chunk but the last is emitted; the last one is carried into the next
+    buffer so chunks (and their overlap) can still span page breaks.
+    """
+    buffer = ""
+    for page in pages:
+        buffer += page
+        if len(buffer) < 4 * chunk_size:
+            continue
+        trailing = buffer[len(buffer.rstrip()):]
+        chunks = splitter.split_text(buffer)
+        yield from chunks[:-1]
+        buffer = chunks[-1] + trailing if chunks else ""
+
+    if buffer:
+        yield from splitter.split_text(buffer)
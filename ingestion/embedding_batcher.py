@@ -0,0 +1,96 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import tiktoken
+from langchain_openai import OpenAIEmbeddings
+
+from app.core.constants import EMBED_MODEL
+
+# --------- CONFIG ---------
+# OpenAI caps an embeddings request at 2048 inputs and 300k tokens in total
+EMBED_MAX_INPUTS = int(os.getenv("EMBED_MAX_INPUTS", 2048))
+EMBED_MAX_TOKENS = int(os.getenv("EMBED_MAX_TOKENS", 100_000))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", 4))
+# Point at a local fake server (python -m ingestion.fake_embedding_server) for tests
+EMBED_BASE_URL = os.getenv("EMBED_BASE_URL")
+# --------------------------
+
+
+def build_embedder(model: str = EMBED_MODEL) -> OpenAIEmbeddings:
+    # chunk_size matches our own packing so each packed request is one API call;
+    # chunks are far below the per-input context limit, so skip langchain's
+    # second tokenization pass and send raw strings
+    return OpenAIEmbeddings(
+        model=model,
+        chunk_size=EMBED_MAX_INPUTS,
+        check_embedding_ctx_length=False,
+        base_url=EMBED_BASE_URL,
+    )
+
+
+def _token_counter(model: str):
+    try:
+        enc = tiktoken.encoding_for_model(model)
+    except Exception:
+        # Unknown model or no tokenizer files available: ~4 chars per token
+        return lambda text: len(text) // 4 + 1
+    return lambda text: len(enc.encode(text, disallowed_special=()))
+
+
+class EmbeddingBatcher:
+    """
+    Packs chunks from many resumes into embedding requests sized by token
+    count and keeps up to `concurrency` requests in flight. Vectors are
+    returned keyed by whatever key the caller attached to each text.
+    """
+
+    def __init__(self, embedder=None, model: str = EMBED_MODEL,
+                 max_tokens: int = EMBED_MAX_TOKENS, max_inputs: int = EMBED_MAX_INPUTS,
+                 concurrency: int = EMBED_CONCURRENCY):
+        self.embedder = embedder or build_embedder(model)
+        self.count_tokens = _token_counter(model)
+        self.max_tokens = max_tokens
+        self.max_inputs = max_inputs
+        self.concurrency = max(1, concurrency)
+
+        self.requests = 0
+        self.texts = 0
+        self.tokens = 0
+        self.seconds = 0.0
+
+    def pack(self, items: Sequence[Tuple[Hashable, str]]) -> List[List[Tuple[Hashable, str]]]:
+        requests, current, current_tokens = [], [], 0
+        for key, text in items:
+            n = self.count_tokens(text)
+            if current and (current_tokens + n > self.max_tokens or len(current) >= self.max_inputs):
+                requests.append(current)
+                current, current_tokens = [], 0
+            current.append((key, text))
+            current_tokens += n
+            self.tokens += n
+        if current:
+            requests.append(current)
+        return requests
+
+    def embed(self, items: Sequence[Tuple[Hashable, str]]) -> Dict[Hashable, List[float]]:
+        if not items:
+            return {}
+
+        start = time.perf_counter()
+        requests = self.pack(items)
+
+        def run(request):
+            return self.embedder.embed_documents([text for _, text in request])
+
+        results: Dict[Hashable, List[float]] = {}
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(requests))) as pool:
+            for request, vectors in zip(requests, pool.map(run, requests)):
+                for (key, _), vec in zip(request, vectors):
+                    results[key] = vec
+
+        self.requests += len(requests)
+        self.texts += len(items)
+        self.seconds += time.perf_counter() - start
+        return results
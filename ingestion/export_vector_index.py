@@ -0,0 +1,23 @@
+"""
+Rebuild the memory-mapped vector index (SEARCH_BACKEND=numpy) from resume_chunks.
+
+    python -m ingestion.export_vector_index
+
+Ingestion keeps the index current by appending new chunks and tombstoning
+deleted ones; a periodic export compacts the tombstones away.
+"""
+import time
+
+from app.core.config import settings
+from app.services.vector_index import get_vector_index
+from db.session import SessionLocal
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = get_vector_index().export(db)
+        print(f"Exported {rows} chunk embeddings to {settings.vector_index_dir} "
+              f"in {time.perf_counter() - start:.2f}s")
+    finally:
+        db.close()
@@ -0,0 +1,49 @@
+"""
+Fill employee_skills for resumes ingested before skill extraction existed
+(or, with --all, re-extract every resume after a taxonomy change).
+
+    python -m ingestion.extract_skills [--all]
+
+New and changed resumes get their skills during ingestion.
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.skills import extract_profile, extract_skills_llm, get_skill_matcher, write_skills
+from db.session import SessionLocal
+
+BATCH_SIZE = 200
+
+RESUMES_SQL = text("""
+    SELECT r.id, r.text_md
+    FROM resumes r
+    WHERE :all OR NOT EXISTS (SELECT 1 FROM employee_skills es WHERE es.resume_id = r.id)
+    ORDER BY r.id
+""")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract skills into employee_skills")
+    parser.add_argument("--all", action="store_true", help="re-extract every resume")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = db.execute(RESUMES_SQL, {"all": args.all}).all()
+        matcher = get_skill_matcher()
+        for i in range(0, len(rows), BATCH_SIZE):
+            batch = rows[i:i + BATCH_SIZE]
+            profiles = {rid: extract_profile(text_md) for rid, text_md in batch}
+            if settings.skills_llm_enabled:
+                for (rid, _), names in zip(batch, extract_skills_llm([t for _, t in batch])):
+                    if names:
+                        profiles[rid].add_llm_skills(names, matcher)
+            write_skills(db, profiles)
+            db.commit()
+            print(f"Extracted skills for {i + len(batch)}/{len(rows)} resumes")
+        print(f"Done in {time.perf_counter() - start:.2f}s")
+    finally:
+        db.close()
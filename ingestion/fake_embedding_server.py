@@ -0,0 +1,85 @@
+"""
+Local stand-in for the OpenAI embeddings endpoint, for exercising the
+ingestion pipeline without network access or API spend:
+
+    python -m ingestion.fake_embedding_server --port 8765
+    EMBED_BASE_URL=http://localhost:8765/v1 python -m ingestion.ingest_initial_resumes
+
+Vectors are deterministic per input, so repeated runs produce identical results.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import struct
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.constants import VECTOR_DIM
+
+
+def fake_vector(item, dim: int = VECTOR_DIM):
+    seed = hashlib.sha256(json.dumps(item).encode("utf-8")).digest()
+    rng = random.Random(seed)
+    vec = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = sum(v * v for v in vec) ** 0.5
+    return [v / norm for v in vec]
+
+
+class FakeEmbeddingHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    dim = VECTOR_DIM
+    requests = 0
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/embeddings"):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        inputs = body["input"]
+        if isinstance(inputs, (str, int)) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+
+        if self.latency:
+            time.sleep(self.latency)
+        type(self).requests += 1
+
+        data = []
+        for i, item in enumerate(inputs):
+            vec = fake_vector(item, self.dim)
+            if body.get("encoding_format") == "base64":
+                vec = base64.b64encode(struct.pack(f"<{len(vec)}f", *vec)).decode("ascii")
+            data.append({"object": "embedding", "index": i, "embedding": vec})
+
+        payload = json.dumps({
+            "object": "list",
+            "data": data,
+            "model": body.get("model"),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 8765, latency: float = 0.0) -> ThreadingHTTPServer:
+    FakeEmbeddingHandler.latency = latency
+    return ThreadingHTTPServer(("127.0.0.1", port), FakeEmbeddingHandler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI embeddings server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds to sleep per request, to mimic network round-trips")
+    args = parser.parse_args()
+
+    print(f"Fake embeddings on http://127.0.0.1:{args.port}/v1")
+    serve(args.port, args.latency).serve_forever()
@@ -1,85 +1,138 @@
 import os
 import glob
-from typing import List
+import json
+import hashlib
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, List, Optional, Set
 
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
 
 from sqlalchemy.orm import Session
 
 from db.session import get_db
-from db.models.employee import Employee
 from db.models.resume import Resume
 from db.models.resume_chunk import ResumeChunk
+from ingestion.document_reader import DocumentReader, stream_chunks
+from ingestion.bulk_writer import BulkResumeWriter, ResumeRecord
+from ingestion.embedding_batcher import EmbeddingBatcher
+from app.core.config import settings
+from app.services.vector_index import get_vector_index
+from app.services.resume_summaries import get_summary_precomputer
+from app.services.skills import extract_profile, extract_skills_llm, get_skill_matcher
+from app.services.embedding_cache import EmbeddingCache, embedding_cache_stats, text_hash as cache_key
 
 # --------- CONFIG ---------
 SOURCE_DIR = "source_files"
 CHUNK_SIZE = 400
 CHUNK_OVERLAP = 100
 EMBED_MODEL = "text-embedding-3-small"
+EXTRACT_WORKERS = int(os.getenv("INGEST_EXTRACT_WORKERS", os.cpu_count() or 1))
+EXTRACT_WINDOW = 4  # extraction submissions in flight per worker
+EXTRACT_CACHE_DIR = os.getenv("INGEST_CACHE_DIR", ".cache/extracted")
+WRITE_BATCH_SIZE = int(os.getenv("INGEST_WRITE_BATCH_SIZE", 64))
 # --------------------------
 
-# Optional: install these packages in requirements.txt
-# pdfplumber==0.9.0
-# python-docx==0.8.11
+SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=CHUNK_SIZE,
+    chunk_overlap=CHUNK_OVERLAP
+)
 
-import pdfplumber
-import docx
+
+# Convert file → text
+def file_to_text(filepath: str) -> str:
+    return "".join(DocumentReader(filepath))
+
+
+def file_hash(filepath: str) -> str:
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Open the document once: metadata, full text and chunks in a single streaming pass.
+# Module-level so it can be pickled and run inside the extraction process pool;
+# results are cached on disk by file hash (and chunking config) so re-runs skip pdfplumber.
+def extract_document(filepath: str, content_hash: str) -> Dict:
+    cache_path = os.path.join(
+        EXTRACT_CACHE_DIR, f"{content_hash}-{CHUNK_SIZE}-{CHUNK_OVERLAP}.json"
+    )
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    reader = DocumentReader(filepath)
+    pages: List[str] = []
+
+    def tee(stream):
+        for page in stream:
+            pages.append(page)
+            yield page
+
+    chunks = list(stream_chunks(tee(reader), SPLITTER, CHUNK_SIZE))
+    doc = {
+        "text": "".join(pages),
+        "chunks": chunks,
+        "email": reader.metadata["email"],
+        "employeeid": reader.metadata["employeeid"],
+    }
+
+    os.makedirs(EXTRACT_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+    os.replace(tmp_path, cache_path)
+    return doc
 
 
 class ResumeIngestionPipeline:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, workers: Optional[int] = None,
+                 batch_size: Optional[int] = None, mp_context=None):
         self.db = db
-        self.embedder = OpenAIEmbeddings(model=EMBED_MODEL)
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=CHUNK_SIZE,
-            chunk_overlap=CHUNK_OVERLAP
-        )
-    def extract_metadata_from_pdf(self, filepath: str):
-        email = None
-        employeeid = None
-        try:
-            with pdfplumber.open(filepath) as pdf:
-                meta = pdf.metadata
-                if meta:
-                    email = meta.get("/employee_email")
-                    employeeid = meta.get("/employee_id")
-        except Exception as e:
-            print(f"Failed to read metadata from {filepath}: {e}")
+        self.workers = max(1, workers or EXTRACT_WORKERS)
+        self.mp_context = mp_context
+        self.batch_size = max(1, batch_size or WRITE_BATCH_SIZE)
+        self.writer = BulkResumeWriter(db)
+        self.batcher = EmbeddingBatcher(model=EMBED_MODEL)
+        self.embedding_cache = EmbeddingCache(db, EMBED_MODEL)
+        self.splitter = SPLITTER
+        self.summary_futures = []
+        # Live counters, read by the API's background ingestion jobs
+        self.progress = {
+            "files_total": 0,
+            "files_skipped": 0,
+            "files_done": 0,
+            "files_failed": 0,
+            "chunks": 0,
+            "embeddings": 0,
+            "summaries": 0,
+            "errors": [],
+        }
 
-        # Fallback if email missing
-        if not email:
-            base_name = os.path.basename(filepath).split(".")[0]
-            email = f"{base_name}@company.com"
-
-        return email, employeeid
+    def record_error(self, fpath: str, error: Exception):
+        print(f"Failed to ingest {fpath}: {error}")
+        self.progress["files_failed"] += 1
+        self.progress["errors"].append({"file": fpath, "error": str(error)})
 
     # Load files
-    def load_files(self) -> List[str]:
+    def load_files(self, source_dir: str = SOURCE_DIR) -> List[str]:
         patterns = ["*.pdf"] ##keeping pdfs for now
         files = []
         for p in patterns:
-            files.extend(glob.glob(os.path.join(SOURCE_DIR, p)))
+            files.extend(glob.glob(os.path.join(source_dir, p)))
         return files
 
     # Convert file → text
     def file_to_text(self, filepath: str) -> str:
-        ext = filepath.split(".")[-1].lower()
-        if ext == "md":
-            with open(filepath, "r", encoding="utf-8") as f:
-                return f.read()
-        elif ext == "pdf":
-            text = ""
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        elif ext == "docx":
-            doc = docx.Document(filepath)
-            text = "\n".join([p.text for p in doc.paragraphs])
-            return text
-        else:
-            raise ValueError(f"Unsupported file type: {ext}")
+        return file_to_text(filepath)
 
     # Chunk text
     def chunk_text(self, text: str) -> List[str]:
@@ -87,98 +140,206 @@ class ResumeIngestionPipeline:
 
     # Generate embeddings
     def embed_chunks(self, chunks: List[str]) -> List[List[float]]:
-        return self.embedder.embed_documents(chunks)
-
-    # Insert into DB
-    def insert_into_db(self, employee_name: str, file_path: str, text: str,
-                   chunks: List[str], embeddings: List[List[float]]):
-
-        email, employeeid = self.extract_metadata_from_pdf(file_path)
-
-
-        # Insert employee
-        employee = self.db.query(Employee).filter(Employee.email == email).first()
-        if not employee:
-            employee = Employee(
-                name=employee_name,
-                email=email,
-                employeeid=employeeid
-            )
-            self.db.add(employee)
-            self.db.commit()
-            self.db.refresh(employee)
-            print(f"Created new employee: {email}")
-        else:
-            if employeeid and employee.employeeid is None:
-                employee.employeeid = employeeid
-                self.db.commit()
-                print(f"Updated employeeid for {email}")
-
-            print(f"Employee {email} already exists (ID={employee.id})")
-
-        
-        # Insert Resume
-        resume = self.db.query(Resume).filter(
-            Resume.employee_email == email,
-            Resume.file_path == file_path
-        ).first()
-
-        if not resume:
-            resume = Resume(
-                employee_email=email,
-                file_path=file_path,
-                text_md=text
-            )
-            self.db.add(resume)
-            self.db.commit()
-            self.db.refresh(resume)
-            print(f"Inserted new resume for {email}")
+        vectors = self.embed_items(list(enumerate(chunks)))
+        return [vectors[i] for i in range(len(chunks))]
+
+    # Embed keyed texts, reading through the embedding cache; only misses hit the API.
+    # Cache rows are written in the caller's transaction.
+    def embed_items(self, items: List[tuple]) -> Dict[object, List[float]]:
+        cached = self.embedding_cache.get_many(t for _, t in items)
+
+        # Identical texts across files are embedded once
+        missing = {}
+        for _, t in items:
+            h = cache_key(t)
+            if h not in cached:
+                missing.setdefault(h, t)
+        fresh = self.batcher.embed(list(missing.items()))
+        self.progress["embeddings"] += len(fresh)
+        self.embedding_cache.put_many({missing[h]: vec for h, vec in fresh.items()})
+        cached.update(fresh)
+
+        return {key: cached[cache_key(t)] for key, t in items}
+
+    # Content hashes of resumes already ingested, keyed by file path. The hash
+    # covers the file's bytes, metadata email included, so a match means the
+    # same (email, file path) resume; the writer keeps one row per file path.
+    def load_resume_hashes(self) -> Dict[str, Optional[str]]:
+        rows = self.db.query(Resume.file_path, Resume.content_hash).all()
+        return {path: h for path, h in rows}
+
+    # Chunk hashes already stored, keyed by resume identity (email, file path);
+    # one query per batch
+    def load_chunk_hashes(self, records: List[ResumeRecord]) -> Dict[tuple, Set[str]]:
+        rows = (
+            self.db.query(Resume.employee_email, Resume.file_path, ResumeChunk.content_hash)
+            .join(ResumeChunk, ResumeChunk.resume_id == Resume.id)
+            .filter(Resume.file_path.in_([r.file_path for r in records]))
+            .all()
+        )
+        hashes: Dict[tuple, Set[str]] = {(r.email, r.file_path): set() for r in records}
+        for email, path, h in rows:
+            # chunks of a row under another email are not reused: that row is replaced
+            if h and (email, path) in hashes:
+                hashes[(email, path)].add(h)
+        return hashes
+
+    # Extracted document → record ready for the writer (chunks keyed by hash)
+    def prepare_record(self, fpath: str, content_hash: str, doc: Dict) -> ResumeRecord:
+        return ResumeRecord(
+            employee_name=os.path.basename(fpath).split(".")[0],
+            email=doc["email"],
+            employeeid=doc["employeeid"],
+            file_path=fpath,
+            text=doc["text"],
+            content_hash=content_hash,
+            chunks={text_hash(c): c for c in doc["chunks"]},
+            skills=extract_profile(doc["text"]),
+        )
+
+    # Embed only chunks whose text changed, then write the batch in one transaction
+    def flush(self, batch: List[ResumeRecord]):
+        if not batch:
+            return
+        existing = self.load_chunk_hashes(batch)
+        items = []
+        for i, r in enumerate(batch):
+            new_hashes = [h for h in r.chunks if h not in existing[(r.email, r.file_path)]]
+            items.extend(((i, h), r.chunks[h]) for h in new_hashes)
+            print(f"{r.employee_name}: {len(r.chunks)} chunks ({len(new_hashes)} re-embedded)")
+
+        try:
+            # Chunks from every file in the batch share packed embedding requests
+            for (i, h), vec in self.embed_items(items).items():
+                batch[i].embeddings[h] = vec
+            if settings.skills_llm_enabled:
+                self.add_llm_skills(batch)
+            self.writer.write_batch(batch)
+        except Exception as e:
+            # the writer rolls back its own failures; this covers embedding-cache rows
+            self.db.rollback()
+            for r in batch:
+                self.record_error(r.file_path, e)
         else:
-            print(f"Resume {file_path} for {email} already exists, updating text and chunks")
-            resume = Resume(
-                id = resume.id,
-                employee_email=email,
-                file_path=file_path,
-                text_md=text,
-            )
-            self.db.commit()
-
-        # Delete old chunks
-        self.db.query(ResumeChunk).filter(
-            ResumeChunk.resume_id == resume.id
-        ).delete(synchronize_session=False)
-        self.db.commit()
-        # Insert chunks
-        for chunk_text, embed in zip(chunks, embeddings):
-            rc = ResumeChunk(
-                resume_id=resume.id,
-                chunk_text=chunk_text,
-                embedding=embed
-            )
-            self.db.add(rc)
-
-        self.db.commit()
+            self.progress["files_done"] += len(batch)
+            self.progress["chunks"] += sum(len(r.chunks) for r in batch)
+            if settings.search_backend == "numpy":
+                self.sync_vector_index()
+            if settings.summary_precompute_enabled:
+                # summaries are generated in the background while later batches ingest
+                self.summary_futures.append(get_summary_precomputer().submit(self.writer.written_resume_ids))
+        batch.clear()
+
+    # Optional LLM pass on top of the dictionary matcher, one request per resume
+    def add_llm_skills(self, batch: List[ResumeRecord]):
+        matcher = get_skill_matcher()
+        for r, names in zip(batch, extract_skills_llm([r.text for r in batch])):
+            if names:
+                r.skills.add_llm_skills(names, matcher)
+
+    def sync_vector_index(self):
+        """Mirror the last committed batch into the memory-mapped index."""
+        index = get_vector_index()
+        if not index.exists():
+            # appending to a missing index would hold only this batch
+            print("No vector index yet, exporting the full corpus")
+            index.export(self.db)
+            return
+        index.delete(self.writer.deleted_chunk_ids)
+        written = self.writer.written_chunks
+        if written:
+            chunk_ids, resume_ids, vectors = zip(*written)
+            index.append(chunk_ids, resume_ids, np.stack(vectors))
 
     # Full pipeline
-    def run(self):
-        files = self.load_files()
+    def run(self, files: Optional[List[str]] = None, stored_paths: Optional[Dict[str, str]] = None):
+        """
+        Ingest `files`. Each is read where it is and stored under its own path,
+        or under `stored_paths[file]` when given (uploads are staged per job but
+        keep a stable path, so a re-upload replaces the earlier resume).
+        """
+        files = files if files is not None else self.load_files()
+        stored_paths = stored_paths or {}
         print(f"Found {len(files)} resumes")
+        self.progress["files_total"] += len(files)
 
+        # Skip files whose bytes are identical to what was last ingested
+        stored = self.load_resume_hashes()
+        pending = []
         for fpath in files:
-            print(f"\n>>> Processing: {fpath}")
+            h = file_hash(fpath)
+            if stored.get(stored_paths.get(fpath, fpath)) == h:
+                continue
+            pending.append((fpath, h))
+        self.progress["files_skipped"] += len(files) - len(pending)
+        print(f"{len(files) - len(pending)} unchanged, {len(pending)} to process "
+              f"with {self.workers} worker(s)")
 
-            text = self.file_to_text(fpath)
-            chunks = self.chunk_text(text)
-            embeddings = self.embed_chunks(chunks)
+        batch: List[ResumeRecord] = []
 
-            emp_name = os.path.basename(fpath).split(".")[0]
+        def collect(fpath: str, h: str, doc: Dict):
+            print(f"\n>>> Processing: {fpath}")
+            batch.append(self.prepare_record(stored_paths.get(fpath, fpath), h, doc))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+
+        if self.workers == 1:
+            for fpath, h in pending:
+                try:
+                    doc = extract_document(fpath, h)
+                except Exception as e:
+                    self.record_error(fpath, e)
+                    continue
+                collect(fpath, h, doc)
+        else:
+            # Extraction is CPU-bound, so it runs in a process pool; the
+            # downstream stages consume files in completion order.
+            # At most EXTRACT_WINDOW x workers files are in flight, and each result
+            # is dropped once collected, so memory does not grow with the corpus.
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=self.mp_context) as pool:
+                queue = iter(pending)
+                futures = {}
+                for f, h in islice(queue, self.workers * EXTRACT_WINDOW):
+                    futures[pool.submit(extract_document, f, h)] = (f, h)
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        fpath, h = futures.pop(future)
+                        for f, nh in islice(queue, 1):
+                            futures[pool.submit(extract_document, f, nh)] = (f, nh)
+                        try:
+                            doc = future.result()
+                        except Exception as e:
+                            self.record_error(fpath, e)
+                            continue
+                        collect(fpath, h, doc)
 
-            self.insert_into_db(emp_name, fpath, text, chunks, embeddings)
-            print(f"Inserted {len(chunks)} chunks for {emp_name}")
+        self.flush(batch)
+        if self.summary_futures:
+            print(f"Waiting for {len(self.summary_futures)} summary batch(es)...")
+            self.progress["summaries"] += get_summary_precomputer().wait(self.summary_futures)
+            self.summary_futures.clear()
+            print(f"Resume summaries: {self.progress['summaries']} generated")
+        stats = embedding_cache_stats()
+        print(f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate)")
+        if self.batcher.requests:
+            print(f"Embeddings: {self.batcher.texts} chunks in {self.batcher.requests} requests, "
+                  f"{self.batcher.seconds:.2f}s")
+        if self.writer.rows_written:
+            print(f"DB writer: {self.writer.rows_written} rows in {self.writer.seconds:.2f}s "
+                  f"({self.writer.rows_per_sec:.0f} rows/sec)")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest resumes from SOURCE_DIR")
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS,
+                        help="number of extraction processes")
+    parser.add_argument("--batch-size", type=int, default=WRITE_BATCH_SIZE,
+                        help="files written per DB transaction")
+    args = parser.parse_args()
+
     db = next(get_db())
-    pipeline = ResumeIngestionPipeline(db)
+    pipeline = ResumeIngestionPipeline(db, workers=args.workers, batch_size=args.batch_size)
     pipeline.run()
     print("\nIngestion complete!")
@@ -0,0 +1,59 @@
+from app.agents.context import MIN_OVERLAP_CHARS, _trim_overlap, build_context, resume_header, token_counter
+
+HEAD = "Led the migration of the billing platform to Kubernetes"
+TAIL = "and cut deployment time from hours to minutes across teams"
+
+
+def match(name, *snippets):
+    return {
+        "employee": {"name": name, "role": "Engineer"},
+        "file_path": f"{name.lower()}.pdf",
+        "snippets": [{"text": s} for s in snippets],
+    }
+
+
+def test_trim_overlap_drops_shared_head():
+    previous = "Worked at Acme. " + HEAD
+    assert _trim_overlap(previous, HEAD + " " + TAIL) == TAIL
+
+
+def test_trim_overlap_drops_shared_tail():
+    # the earlier chunk arrives second: its tail is the head of `previous`
+    previous = HEAD + " " + TAIL
+    assert _trim_overlap(previous, "Worked at Acme. " + HEAD) == "Worked at Acme."
+
+
+def test_trim_overlap_ignores_short_coincidences():
+    short = "x" * (MIN_OVERLAP_CHARS - 1)
+    text = short + " unrelated"
+    assert _trim_overlap("ends with " + short, text) == text
+
+
+def test_snippets_are_packed_round_robin_by_rank():
+    matches = [match("Ada", "ada best", "ada second"), match("Bo", "bo best", "bo second")]
+    count = token_counter()
+    # room for both headers and best snippets, not for any second snippet
+    budget = sum(count(resume_header(m)) + 2 + count(m["snippets"][0]["text"]) + 1 for m in matches)
+
+    context = build_context(matches, budget)
+    assert "ada best" in context and "bo best" in context
+    assert "second" not in context
+    assert context.index("### Ada") < context.index("### Bo")
+
+
+def test_context_stays_within_budget():
+    matches = [match(f"P{i}", *(f"snippet {i}.{j} " * 10 for j in range(3))) for i in range(10)]
+    for budget in (0, 10, 50, 200, 1000):
+        assert token_counter()(build_context(matches, budget)) <= budget + 2
+
+
+def test_duplicate_snippets_are_dropped_across_resumes():
+    context = build_context([match("Ada", "Same text here"), match("Bo", "Same  text\n here")], 1000)
+    assert context.count("ext here") == 1
+    assert "### Bo" not in context
+
+
+def test_overlap_with_a_picked_snippet_is_trimmed():
+    context = build_context([match("Ada", "Worked at Acme. " + HEAD, HEAD + " " + TAIL)], 1000)
+    assert context.count(HEAD) == 1
+    assert TAIL in context
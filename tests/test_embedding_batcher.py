@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+from langchain_openai import OpenAIEmbeddings
+
+from app.core.constants import EMBED_MODEL
+from ingestion.embedding_batcher import EmbeddingBatcher
+from ingestion.fake_embedding_server import FakeEmbeddingHandler, fake_vector, serve
+
+
+@pytest.fixture
+def fake_server():
+    server = serve(port=0)
+    FakeEmbeddingHandler.requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def make_batcher(base_url, **kwargs):
+    embedder = OpenAIEmbeddings(
+        model=EMBED_MODEL,
+        chunk_size=kwargs.get("max_inputs", 2048),
+        check_embedding_ctx_length=False,
+        base_url=base_url,
+        max_retries=0,
+    )
+    return EmbeddingBatcher(embedder=embedder, **kwargs)
+
+
+def chunk(i, words=20):
+    return f"resume chunk {i} " + "python sql " * words
+
+
+def test_pack_respects_token_and_input_limits(fake_server):
+    batcher = make_batcher(fake_server, max_tokens=200, max_inputs=3, concurrency=2)
+    items = [(("r", i), chunk(i, words=5 + i % 7)) for i in range(40)]
+
+    requests = batcher.pack(items)
+
+    assert [item for request in requests for item in request] == items
+    for request in requests:
+        assert len(request) <= 3
+        assert sum(batcher.count_tokens(text) for _, text in request) <= 200
+
+    vectors = batcher.embed(items)
+    assert FakeEmbeddingHandler.requests == batcher.requests == len(requests)
+    assert len(vectors) == 40
+
+
+def test_vectors_map_back_to_their_keys(fake_server):
+    batcher = make_batcher(fake_server, max_tokens=150, max_inputs=4, concurrency=4)
+    items = [((f"emp{i % 5}@company.com", f"hash{i}"), chunk(i)) for i in range(30)]
+
+    vectors = batcher.embed(items)
+
+    assert set(vectors) == {key for key, _ in items}
+    for key, text in items:
+        assert vectors[key] == pytest.approx(fake_vector(text), abs=1e-6)
+
+
+def test_oversized_input_is_sent_alone(fake_server):
+    batcher = make_batcher(fake_server, max_tokens=100, max_inputs=10)
+    big = chunk("big", words=200)
+    assert batcher.count_tokens(big) > 100
+    items = [("a", chunk("a", 5)), ("big", big), ("b", chunk("b", 5)), ("c", chunk("c", 5))]
+
+    requests = batcher.pack(items)
+
+    assert requests[1] == [("big", big)]
+    assert ("a", items[0][1]) in requests[0] and ("b", items[2][1]) in requests[2]
+
+    vectors = batcher.embed(items)
+    assert vectors["big"] == pytest.approx(fake_vector(big), abs=1e-6)
+    assert set(vectors) == {"a", "big", "b", "c"}
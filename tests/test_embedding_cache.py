@@ -0,0 +1,22 @@
+from app.services.embedding_cache import EmbeddingCache, text_hash
+
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+
+
+def test_put_many_inserts_rows_as_executemany(monkeypatch):
+    monkeypatch.setattr("app.services.embedding_cache.EVICT_CHECK_EVERY", 10 ** 9)
+    db = RecordingSession()
+    vectors = {f"chunk {i}": [float(i), 0.0] for i in range(30_000)}
+    EmbeddingCache(db, "test-model").put_many(vectors)
+
+    (stmt, rows), = db.calls
+    # 3 parameters per row: a single VALUES list would exceed 65535 binds
+    assert not stmt._multi_values
+    assert len(rows) == 30_000
+    assert rows[0] == {"model": "test-model", "text_hash": text_hash("chunk 0"), "embedding": [0.0, 0.0]}
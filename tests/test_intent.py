@@ -0,0 +1,20 @@
+import pytest
+
+from app.agents.nodes.intent import fast_classify
+
+
+@pytest.mark.parametrize("query", [
+    "Is Priya free on Thursday afternoon?",
+    "Who is free tomorrow to meet the client?",
+    "Check calendar availability for the data team next week",
+])
+def test_availability_with_time_cue(query):
+    assert fast_classify(query)[0] == "availability_check"
+
+
+@pytest.mark.parametrize("query", [
+    "Find engineers who contributed to free software projects",
+    "Search resumes that mention free-text search with Elasticsearch",
+])
+def test_free_without_time_cue_is_not_availability(query):
+    assert fast_classify(query)[0] != "availability_check"
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.services import semantic_search
+from app.services.semantic_search import (
+    HNSW_MAX_EF_SEARCH,
+    AsyncSemanticSearchService,
+    SemanticSearchService,
+    max_candidates,
+)
+
+
+class RecordingDB:
+    def __init__(self):
+        self.params = []
+
+    def execute(self, sql, params=None):
+        self.params.append(params)
+
+
+@pytest.mark.parametrize("mode", ["none", "halfvec", "binary"])
+@pytest.mark.parametrize("multiplier", [1, 4, 16])
+@pytest.mark.parametrize("ef_search", [None, 10, 40, HNSW_MAX_EF_SEARCH])
+def test_scan_limit_never_exceeds_ef_search(monkeypatch, mode, multiplier, ef_search):
+    monkeypatch.setattr(settings, "vector_compact_mode", mode)
+    monkeypatch.setattr(settings, "vector_rescore_multiplier", multiplier)
+    monkeypatch.setattr(settings, "search_max_candidates", 5000)
+    service = SemanticSearchService.__new__(SemanticSearchService)
+    service.db = RecordingDB()
+
+    for candidates in (1, 50, 250, 999, max_candidates()):
+        shortlist = service.set_window(candidates, ef_search, None)
+        applied_ef = int(service.db.params[-1]["ef_search"])
+        # the index scan LIMIT is :shortlist in compact modes, :candidates otherwise
+        scan_limit = shortlist if mode != "none" else candidates
+        assert scan_limit <= applied_ef <= HNSW_MAX_EF_SEARCH
+        assert candidates <= shortlist
+
+
+def test_candidate_window_is_capped_at_ef_search_limit(monkeypatch):
+    monkeypatch.setattr(settings, "search_max_candidates", 5000)
+    assert max_candidates() == HNSW_MAX_EF_SEARCH
+    monkeypatch.setattr(settings, "search_max_candidates", 200)
+    assert max_candidates() == 200
+
+
+def test_compact_shortlist_keeps_rescore_margin_below_cap(monkeypatch):
+    monkeypatch.setattr(settings, "vector_compact_mode", "binary")
+    monkeypatch.setattr(settings, "vector_rescore_multiplier", 4)
+    assert semantic_search.scan_window(50) == 200
+    assert semantic_search.scan_window(400) == HNSW_MAX_EF_SEARCH
+
+
+class FakeAsyncSession:
+    """Tracks whether a transaction (and so a pooled connection) is held."""
+
+    def __init__(self):
+        self.in_transaction = False
+
+    async def run_sync(self, fn):
+        self.in_transaction = True
+        return fn(None)
+
+    async def commit(self):
+        self.in_transaction = False
+
+
+class ThreadRecordingIndex:
+    def __init__(self):
+        self.threads = []
+
+    def search(self, embedding, top_k, snippets=3, after=(None, None)):
+        self.threads.append(threading.get_ident())
+        return [{"resume_id": 1, "score": 0.1, "chunks": []}]
+
+
+@pytest.fixture
+def numpy_backend(monkeypatch):
+    index = ThreadRecordingIndex()
+    monkeypatch.setattr(settings, "search_backend", "numpy")
+    monkeypatch.setattr(settings, "search_cache_enabled", False)
+    monkeypatch.setattr(semantic_search, "get_vector_index", lambda: index)
+    monkeypatch.setattr(semantic_search.SemanticSearchService, "__init__", lambda self, db: None)
+
+    async def embed_queries(self, queries):
+        return [[1.0, 0.0] for _ in queries]
+
+    async def index_matches(self, hits, include_text):
+        return hits
+
+    monkeypatch.setattr(AsyncSemanticSearchService, "embed_queries", embed_queries)
+    monkeypatch.setattr(AsyncSemanticSearchService, "index_matches", index_matches)
+    return index
+
+
+def test_async_numpy_search_scans_off_the_event_loop(numpy_backend):
+    service = AsyncSemanticSearchService.__new__(AsyncSemanticSearchService)
+    service.db = FakeAsyncSession()
+
+    async def run():
+        loop_thread = threading.get_ident()
+        matches = await service.search("python", top_k=1)
+        batch = await service.search_batch(["python", "rust"], top_k=1)
+        return loop_thread, matches, batch
+
+    loop_thread, matches, batch = asyncio.run(run())
+    assert matches[0]["resume_id"] == 1
+    assert set(batch) == {"python", "rust"}
+    assert len(numpy_backend.threads) == 3
+    assert loop_thread not in numpy_backend.threads
+
+
+class FakeEmbeddingCache:
+    def __init__(self, db, model, touch=True):
+        pass
+
+    def get_many(self, queries):
+        return {}
+
+    def put_many(self, vectors):
+        pass
+
+
+def test_connection_is_released_before_the_embeddings_call(monkeypatch):
+    monkeypatch.setattr(semantic_search, "EmbeddingCache", FakeEmbeddingCache)
+    service = AsyncSemanticSearchService.__new__(AsyncSemanticSearchService)
+    service.db = FakeAsyncSession()
+    held_during_call = []
+
+    class Embedder:
+        async def aembed_documents(self, texts):
+            held_during_call.append(service.db.in_transaction)
+            return [[0.5, 0.5] for _ in texts]
+
+    service.embedder = Embedder()
+    embeddings = asyncio.run(service.embed_queries(["connection release probe query"]))
+    assert embeddings == [[0.5, 0.5]]
+    assert held_during_call == [False]
@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+
+from app.services.skills import (
+    SKILL_TAXONOMY,
+    SkillMatcher,
+    SkillProfile,
+    extract_seniority,
+    extract_years,
+    write_skills,
+)
+
+matcher = SkillMatcher(SKILL_TAXONOMY)
+
+
+def test_aliases_match_on_word_boundaries_only():
+    assert matcher.find("JavaScript and TypeScript") == {"javascript": 1, "typescript": 1}
+    assert "go" not in matcher.find("Go-to person for ongoing work")
+
+
+def test_longest_alias_wins_over_the_one_it_covers():
+    assert matcher.find("Built apps in React Native") == {"react native": 1}
+    assert matcher.find("React Native and React.js") == {"react native": 1, "react": 1}
+    assert matcher.find("Apache Kafka, Kafka streams") == {"kafka": 2}
+
+
+@pytest.mark.parametrize("text", [
+    "Lambda calculus coursework",
+    "Worked on the RAG status report",
+    "Liaised with the QA team",
+    "Shipping containers logistics",
+    "Rated S3 in the internal ladder",
+])
+def test_ambiguous_words_are_not_skills(text):
+    assert matcher.find(text) == {}
+
+
+def test_qualified_aliases_still_match():
+    found = matcher.find("AWS Lambda, Amazon S3, retrieval augmented generation, QA automation")
+    assert found == {"aws": 2, "llms": 1, "testing": 1}
+
+
+def test_seniority_comes_from_role_lines_not_prose():
+    resume = """
+# Jane Doe
+Senior Software Engineer, Acme (2019 - 2023)
+
+- Reported to the Director of Engineering and worked with the team lead
+"""
+    assert extract_seniority(resume, None) == "senior"
+
+
+def test_seniority_ignores_bullets_and_falls_back_to_years():
+    resume = "Software Engineer\n- Presented the roadmap to our VP of Product\n"
+    assert extract_seniority(resume, 3.0) == "mid"
+    assert extract_seniority("### Head of Platform\n", None) == "principal"
+
+
+def test_education_ranges_are_not_career_years():
+    resume = """
+## Experience
+Software Engineer, Acme, 2021 - 2023
+
+## Education
+B.Tech Computer Science, 2012 - 2016
+"""
+    assert extract_years(resume) == 2.0
+
+
+def test_degree_lines_outside_education_section_are_skipped():
+    resume = "Engineer at Acme 2020 - 2022\nBachelor of Science, State University 2010 - 2014\n"
+    assert extract_years(resume) == 2.0
+
+
+def test_present_counts_up_to_this_year():
+    start = date.today().year - 5
+    assert extract_years(f"Engineer at Acme, {start} - present") == 5.0
+
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+
+
+def test_write_skills_inserts_rows_as_executemany():
+    db = RecordingSession()
+    profiles = {
+        rid: SkillProfile(skills={f"skill{i}": ("other", 1, "dictionary") for i in range(3)}, seniority="mid")
+        for rid in (1, 2)
+    }
+    write_skills(db, profiles)
+
+    (_, deleted), (insert_stmt, rows) = db.calls
+    assert deleted == {"resume_ids": [1, 2]}
+    # parameters go in as a list of rows, not as one multi-VALUES statement
+    assert len(rows) == 6 and not insert_stmt._multi_values
+    assert {r["resume_id"] for r in rows} == {1, 2}
@@ -0,0 +1,42 @@
+import asyncio
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langgraph.graph import END, StateGraph
+
+from app.agents import streaming
+from app.agents.state import NO_STREAM_TAG
+
+
+class State(TypedDict):
+    query: str
+    answer: str
+
+
+def fake_llm(text):
+    return GenericFakeChatModel(messages=iter([text]))
+
+
+async def generate_talent_gap(state: State):
+    # concurrent map calls, as in map_reduce_gap, then the final call
+    background = [fake_llm(f"map {i} findings").with_config(tags=[NO_STREAM_TAG]) for i in range(3)]
+    await asyncio.gather(*(m.ainvoke("map") for m in background))
+    state["answer"] = (await fake_llm("final gap analysis").ainvoke("reduce")).content
+    return state
+
+
+def test_only_untagged_calls_stream_tokens(monkeypatch):
+    graph = StateGraph(State)
+    graph.add_node("generate_talent_gap", generate_talent_gap)
+    graph.set_entry_point("generate_talent_gap")
+    graph.add_edge("generate_talent_gap", END)
+    monkeypatch.setattr(streaming, "hr_agent", graph.compile())
+    monkeypatch.setattr(streaming, "initial_state", lambda query: {"query": query, "answer": ""})
+
+    async def collect():
+        return [e async for e in streaming.stream_agent("gaps?")]
+
+    events = asyncio.run(collect())
+    tokens = "".join(e["content"] for e in events if e["event"] == "token")
+    assert tokens == "final gap analysis"
+    assert events[-1]["answer"] == "final gap analysis"
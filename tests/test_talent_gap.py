@@ -0,0 +1,62 @@
+import asyncio
+
+from app.agents.context import token_counter
+from app.agents.tools import talent_gap_tool
+from app.core.config import settings
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Answers every merge with a short summary and records prompt sizes."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.prompts = []
+
+    async def abatch(self, prompts, config=None, return_exceptions=False):
+        self.prompts.extend(prompts)
+        if self.fail:
+            return [RuntimeError("boom") for _ in prompts]
+        return [Response("merged findings " * 20) for _ in prompts]
+
+
+def findings(n, words=300):
+    return [(5, f"batch {i}: " + "python kubernetes gap " * words) for i in range(n)]
+
+
+def test_findings_within_budget_are_not_merged(monkeypatch):
+    monkeypatch.setattr(settings, "talent_gap_reduce_max_tokens", 100_000)
+    llm = FakeLLM()
+    monkeypatch.setattr(talent_gap_tool, "background_llm", llm)
+
+    merged = asyncio.run(talent_gap_tool.merge_findings("python", findings(4)))
+    assert len(merged) == 4 and not llm.prompts
+
+
+def test_large_pools_are_reduced_hierarchically_under_budget(monkeypatch):
+    budget = 2000
+    monkeypatch.setattr(settings, "talent_gap_reduce_max_tokens", budget)
+    llm = FakeLLM()
+    monkeypatch.setattr(talent_gap_tool, "background_llm", llm)
+
+    merged = asyncio.run(talent_gap_tool.merge_findings("python", findings(40)))
+    count = token_counter()
+    prompt_overhead = count(talent_gap_tool.MERGE_PROMPT.format(query="python", count=200, context=""))
+    assert llm.prompts
+    assert all(count(p) <= budget + prompt_overhead for p in llm.prompts)
+    assert sum(count(text) for _, text in merged) <= budget
+    # people counts survive the merges
+    assert sum(n for n, _ in merged) == 200
+
+
+def test_failed_merges_still_converge(monkeypatch):
+    monkeypatch.setattr(settings, "talent_gap_reduce_max_tokens", 2000)
+    monkeypatch.setattr(talent_gap_tool, "background_llm", FakeLLM(fail=True))
+
+    merged = asyncio.run(talent_gap_tool.merge_findings("python", findings(40)))
+    assert sum(token_counter()(text) for _, text in merged) <= 2000
+    assert sum(n for n, _ in merged) == 200